@@ -1,30 +1,88 @@
+from __future__ import annotations
+
 import streamlit as st
+import streamlit.components.v1 as components
 import sqlite3
 import json
 from datetime import datetime, timedelta
-import plotly.graph_objects as go
-import plotly.express as px
-import pandas as pd
-from typing import List, Dict, Optional, Tuple
+from typing import TYPE_CHECKING, Callable, List, Dict, Optional, Tuple, Union
 import os
 import hashlib
+import math
+import operator
 import re
+import secrets
 from dataclasses import dataclass
 from enum import Enum
 import time
-import base64
+import threading
+import copy
+import functools
+import itertools
 from io import BytesIO
+from concurrent.futures import Future, ThreadPoolExecutor
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import plotly.graph_objects as go
+
+# Optional imports with error handling, loaded on first use
+@functools.lru_cache(maxsize=1)
+def _get_pypdf2():
+    try:
+        import PyPDF2
+    except ImportError:
+        PyPDF2 = None
+    return PyPDF2
+
+@functools.lru_cache(maxsize=1)
+def _get_fitz():
+    try:
+        import fitz  # PyMuPDF
+    except ImportError:
+        fitz = None
+    return fitz
+
+@functools.lru_cache(maxsize=1)
+def _get_pdfium():
+    try:
+        import pypdfium2 as pdfium
+    except ImportError:
+        pdfium = None
+    return pdfium
+
+@functools.lru_cache(maxsize=1)
+def _get_gtts():
+    try:
+        from gtts import gTTS
+    except ImportError:
+        gTTS = None
+    return gTTS
 
-# Optional imports with error handling
 try:
-    import PyPDF2
+    import orjson
+    
+    def json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode('utf-8')
+    
+    def json_dumps_pretty(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    
+    json_loads = orjson.loads
 except ImportError:
-    PyPDF2 = None
+    orjson = None
+    json_loads = json.loads
     
+    def json_dumps(obj) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+    
+    def json_dumps_pretty(obj) -> str:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+
 try:
-    from gtts import gTTS
+    from json_repair import repair_json
 except ImportError:
-    gTTS = None
+    repair_json = None
 
 # ============================
 # CONFIGURATION & CONSTANTS
@@ -57,23 +115,366 @@ class InterviewConfig:
 
 CONFIG = InterviewConfig()
 
+# Comma-separated skill lists ("Python, SQL ,Git"), whitespace around commas dropped
+_SKILL_RE = re.compile(r'\s*,\s*')
+
+# Experience/skills keywords a CV must mention somewhere (substring match, like `in`)
+_CV_KEYWORDS_RE = re.compile(
+    r'pengalaman|experience|kerja|work|skill|kemampuan|keahlian|kompeten', re.IGNORECASE
+)
+
 # ============================
 # ENHANCED DATABASE OPERATIONS
 # ============================
 
+# The eight scored categories, in interview_results column order
+_SCORE_KEYS = (
+    'komunikasi', 'problem_solving', 'leadership', 'teamwork',
+    'pengetahuan_teknis', 'adaptabilitas', 'kreativitas', 'critical_thinking'
+)
+_INV_N = 1.0 / len(_SCORE_KEYS)
+
+# Display labels for score categories ("problem_solving" -> "Problem Solving")
+_CATEGORY_LABELS = {k: k.replace('_', ' ').title() for k in _SCORE_KEYS}
+
+def _category_label(key: str) -> str:
+    return _CATEGORY_LABELS.get(key) or key.replace('_', ' ').title()
+
+# Short column headers for the per-record score table in history, in _SCORE_KEYS order
+_SCORE_TABLE_LABELS = (
+    'Communication', 'Problem Solving', 'Leadership', 'Teamwork',
+    'Technical', 'Adaptability', 'Creativity', 'Critical Think'
+)
+
+# Score (0-100, floored) -> grade / bar color lookup tables
+_GRADES = tuple(
+    "E (Needs Improvement)" if i < 60 else "D (Fair)" if i < 70 else "C (Good)" if i < 80
+    else "B (Very Good)" if i < 90 else "A (Excellent)"
+    for i in range(101)
+)
+_BAR_COLORS = tuple('#ef4444' if i < 60 else '#f59e0b' if i < 75 else '#10b981' for i in range(101))
+
+# Seconds (0-600) -> "Xm Ys"; most interview and answer durations fall in this range
+_DURATIONS = tuple(f"{i // 60}m {i % 60}s" for i in range(601))
+
+_SCORE_DEFAULTS = dict.fromkeys(_SCORE_KEYS, 0.0)
+_SCORE_GET = operator.itemgetter(*_SCORE_KEYS)
+
+# result_data fields in SQL_INSERT_RESULT parameter order (job_title is required)
+_RESULT_GET = operator.itemgetter(
+    'job_title', 'difficulty', 'duration', 'questions_answered',
+    'transcript', 'detailed_feedback', 'recommendations'
+)
+_RESULT_DEFAULTS = {
+    'difficulty': None, 'duration': 0, 'questions_answered': 0,
+    'transcript': None, 'detailed_feedback': None, 'recommendations': None
+}
+
+_HISTORY_COLUMNS = frozenset({
+    'id', 'user_id', 'session_id', 'job_title', 'difficulty_level', 'komunikasi',
+    'problem_solving', 'leadership', 'teamwork', 'pengetahuan_teknis', 'adaptabilitas',
+    'kreativitas', 'critical_thinking', 'total_score', 'pass_status', 'interview_duration',
+    'questions_answered', 'interview_transcript', 'detailed_feedback', 'recommendations',
+    'created_at'
+})
+
+# Columns shown in history lists and timelines
+_HISTORY_DEFAULT_COLUMNS = ('session_id', 'job_title', 'total_score', 'pass_status', 'created_at')
+
+# Columns needed by the detailed history view
+_HISTORY_DETAIL_COLUMNS = _HISTORY_DEFAULT_COLUMNS + ('difficulty_level',) + _SCORE_KEYS + (
+    'interview_duration', 'questions_answered', 'detailed_feedback'
+)
+
+# Numeric dtypes for user_progress frames so charts can use .values directly
+_PROGRESS_DTYPES = {'metric_value': 'float32', 'improvement_rate': 'float32'}
+
+def _iter_rows(cursor: sqlite3.Cursor, batch_size: int = 100):
+    """Yield rows as dicts, pulling them from SQLite in batches"""
+    for batch in iter(lambda: cursor.fetchmany(batch_size), []):
+        for row in batch:
+            yield dict(row)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_history(db_path: str, user_id: str, version: int, limit: int, columns: Tuple[str, ...],
+                   _conn: sqlite3.Connection) -> List[Dict]:
+    """Cached interview history query (db_path/user_id/version/limit/columns form the cache key)"""
+    cursor = _conn.cursor()
+    
+    cursor.execute(f'''
+        SELECT {', '.join(columns)} FROM interview_results 
+        WHERE user_id = ? 
+        ORDER BY created_at DESC
+        LIMIT ?
+    ''', (user_id, limit))
+    
+    # st.cache_data needs a picklable value, so the batches are collected here
+    return list(_iter_rows(cursor))
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_history_page(db_path: str, user_id: str, version: int, pass_only: Optional[bool], job_title: Optional[str],
+                        difficulty: Optional[str], limit: int, offset: int, columns: Tuple[str, ...],
+                        _conn: sqlite3.Connection) -> List[Dict]:
+    """Cached filtered page of interview history; filters left as None are not applied"""
+    clauses = ['user_id = ?']
+    params = [user_id]
+    if pass_only is not None:
+        clauses.append('pass_status = ?')
+        params.append(pass_only)
+    if job_title is not None:
+        clauses.append('job_title = ?')
+        params.append(job_title)
+    if difficulty is not None:
+        clauses.append('difficulty_level = ?')
+        params.append(difficulty)
+    params += (limit, offset)
+    
+    cursor = _conn.execute(f'''
+        SELECT {', '.join(columns)} FROM interview_results
+        WHERE {' AND '.join(clauses)}
+        ORDER BY created_at DESC
+        LIMIT ? OFFSET ?
+    ''', params)
+    return list(_iter_rows(cursor))
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_score_series(db_path: str, user_id: str, version: int, limit: int, _conn: sqlite3.Connection):
+    """Cached (dates, total_scores) arrays of the most recent interviews"""
+    import numpy as np
+    
+    rows = _conn.execute('''
+        SELECT created_at, total_score FROM interview_results
+        WHERE user_id = ?
+        ORDER BY created_at DESC
+        LIMIT ?
+    ''', (user_id, limit)).fetchall()
+    
+    dates = np.array([r[0] for r in rows], dtype=object)
+    scores = np.array([r[1] for r in rows], dtype=np.float64)
+    return dates, scores
+
+@dataclass(frozen=True, slots=True)
+class Analytics:
+    """Per-user analytics snapshot (immutable, so cached copies can't be altered)"""
+    total_interviews: int
+    avg_score: float
+    improvement_rate: float
+    strongest_area: Tuple[str, float]
+    weakest_area: Tuple[str, float]
+    category_scores: Dict[str, float]
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_analytics(db_path: str, user_id: str, version: int, _conn: sqlite3.Connection) -> Analytics:
+    """Cached analytics query (db_path/user_id/version form the cache key)"""
+    cursor = _conn.cursor()
+    
+    # Counts, averages and first-vs-last improvement in a single round-trip
+    cursor.execute('''
+        WITH r AS (
+            SELECT total_score, komunikasi, problem_solving, leadership,
+                   teamwork, pengetahuan_teknis, adaptabilitas,
+                   ROW_NUMBER() OVER (ORDER BY created_at ASC, id ASC) AS rn_asc,
+                   ROW_NUMBER() OVER (ORDER BY created_at DESC, id DESC) AS rn_desc
+            FROM interview_results
+            WHERE user_id = ?
+        )
+        SELECT COUNT(*) AS total_interviews,
+               AVG(total_score) AS avg_score,
+               AVG(komunikasi) AS kom, AVG(problem_solving) AS ps,
+               AVG(leadership) AS lead, AVG(teamwork) AS team,
+               AVG(pengetahuan_teknis) AS tech, AVG(adaptabilitas) AS adapt,
+               (MAX(CASE WHEN rn_desc = 1 THEN total_score END)
+                - MAX(CASE WHEN rn_asc = 1 THEN total_score END)) * 100.0
+                / NULLIF(MAX(CASE WHEN rn_asc = 1 THEN total_score END), 0) AS improvement
+        FROM r
+    ''', (user_id,))
+    row = cursor.fetchone()
+    
+    total_interviews = row['total_interviews']
+    avg_score = row['avg_score'] or 0
+    
+    improvement_rate = (row['improvement'] or 0) if total_interviews >= 2 else 0
+    
+    # Strongest and weakest areas
+    areas = {
+        'Komunikasi': row['kom'] or 0,
+        'Problem Solving': row['ps'] or 0,
+        'Leadership': row['lead'] or 0,
+        'Teamwork': row['team'] or 0,
+        'Pengetahuan Teknis': row['tech'] or 0,
+        'Adaptabilitas': row['adapt'] or 0
+    }
+    
+    # Single pass for argmax/argmin (first wins on ties, like max/min)
+    best_k = worst_k = None
+    best_v = worst_v = 0
+    for k, v in areas.items():
+        if best_k is None:
+            best_k, best_v = worst_k, worst_v = k, v
+        elif v > best_v:
+            best_k, best_v = k, v
+        elif v < worst_v:
+            worst_k, worst_v = k, v
+    
+    strongest = (best_k, best_v) if best_k is not None else ('N/A', 0)
+    weakest = (worst_k, worst_v) if worst_k is not None else ('N/A', 0)
+    
+    return Analytics(
+        total_interviews=total_interviews,
+        avg_score=round(avg_score, 2),
+        improvement_rate=round(improvement_rate, 2),
+        strongest_area=strongest,
+        weakest_area=weakest,
+        category_scores=areas
+    )
+
+@dataclass(frozen=True, slots=True)
+class HistorySummary:
+    """Summary stats and filter options over all of a user's interviews"""
+    total: int
+    avg_score: float
+    passed: int
+    pass_rate: float
+    job_titles: Tuple[str, ...]
+    difficulty_levels: Tuple[str, ...]
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_history_summary(db_path: str, user_id: str, version: int, _conn: sqlite3.Connection) -> HistorySummary:
+    """Cached history summary, aggregated in SQL over every row so it matches the paged list"""
+    total, avg_score, passed = _conn.execute('''
+        SELECT COUNT(*), COALESCE(AVG(total_score), 0), COALESCE(SUM(pass_status), 0)
+        FROM interview_results WHERE user_id = ?
+    ''', (user_id,)).fetchone()
+    
+    # Newest first, so filter options don't reshuffle as older rows age out of view
+    job_titles = _conn.execute('''
+        SELECT job_title FROM interview_results WHERE user_id = ?
+        GROUP BY job_title ORDER BY MAX(created_at) DESC
+    ''', (user_id,)).fetchall()
+    difficulty_levels = _conn.execute('''
+        SELECT difficulty_level FROM interview_results
+        WHERE user_id = ? AND difficulty_level IS NOT NULL AND difficulty_level != ''
+        GROUP BY difficulty_level ORDER BY MAX(created_at) DESC
+    ''', (user_id,)).fetchall()
+    
+    return HistorySummary(
+        total=total,
+        avg_score=avg_score,
+        passed=passed,
+        pass_rate=(passed / total * 100) if total > 0 else 0,
+        job_titles=tuple(row[0] for row in job_titles),
+        difficulty_levels=tuple(row[0] for row in difficulty_levels)
+    )
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _fetch_job_market(db_path: str, _conn: sqlite3.Connection) -> List[Dict]:
+    """Cached job_market rows as dicts (the table is seed data and rarely changes)"""
+    cursor = _conn.execute('''
+        SELECT job_title, category, avg_salary_min, avg_salary_max,
+               demand_level, required_skills, description
+        FROM job_market
+        ORDER BY id
+    ''')
+    return list(_iter_rows(cursor))
+
 class DatabaseManager:
     """Enhanced database manager with connection pooling and better error handling"""
     
+    # db_paths whose schema/seed already ran in this process
+    _initialized = set()
+    _init_lock = threading.Lock()
+    # db_paths whose interview_results has a plain (written) pass_status column
+    _stored_pass_status = set()
+    # (db_path, user_id) -> data version; part of every cached per-user read's key
+    _data_versions: Dict[Tuple[str, str], int] = {}
+    _version_counter = itertools.count(1)
+    
+    # Fixed statement text so sqlite3's per-connection statement cache reuses the prepared plan
+    # Native upsert keeps id/created_at; the WHERE skips the row rewrite when nothing changed
+    SQL_UPSERT_PROFILE = '''
+        INSERT INTO user_profiles 
+        (user_id, email, full_name, cv_text, cv_hash, target_job, job_category, 
+         experience_years, education_level, skills, preferences, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(user_id) DO UPDATE SET
+            email = excluded.email,
+            full_name = excluded.full_name,
+            cv_text = excluded.cv_text,
+            cv_hash = excluded.cv_hash,
+            target_job = excluded.target_job,
+            job_category = excluded.job_category,
+            experience_years = excluded.experience_years,
+            education_level = excluded.education_level,
+            skills = excluded.skills,
+            preferences = excluded.preferences,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE user_profiles.cv_hash IS NOT excluded.cv_hash
+           OR user_profiles.target_job IS NOT excluded.target_job
+           OR user_profiles.email IS NOT excluded.email
+           OR user_profiles.full_name IS NOT excluded.full_name
+           OR user_profiles.job_category IS NOT excluded.job_category
+           OR user_profiles.experience_years IS NOT excluded.experience_years
+           OR user_profiles.education_level IS NOT excluded.education_level
+           OR user_profiles.skills IS NOT excluded.skills
+           OR user_profiles.preferences IS NOT excluded.preferences
+    '''
+    
+    SQL_INSERT_RESULT = '''
+        INSERT INTO interview_results 
+        (user_id, session_id, job_title, difficulty_level, interview_duration, 
+         questions_answered, interview_transcript, detailed_feedback, recommendations, 
+         komunikasi, problem_solving, leadership, teamwork, pengetahuan_teknis, 
+         adaptabilitas, kreativitas, critical_thinking, total_score)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    
+    SQL_INSERT_RESULT_STORED_PASS = '''
+        INSERT INTO interview_results 
+        (user_id, session_id, job_title, difficulty_level, interview_duration, 
+         questions_answered, interview_transcript, detailed_feedback, recommendations, 
+         komunikasi, problem_solving, leadership, teamwork, pengetahuan_teknis, 
+         adaptabilitas, kreativitas, critical_thinking, total_score, pass_status)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    
+    SQL_INSERT_QA = '''
+        INSERT INTO qa_history 
+        (user_id, session_id, question_id, category, question, answer, 
+         answer_length, response_time, score, feedback)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    
     def __init__(self, db_path: str = 'interview_training.db'):
         self.db_path = db_path
-        self.init_database()
+        self._local = threading.local()
+        with DatabaseManager._init_lock:
+            if db_path not in DatabaseManager._initialized:
+                self.init_database()
+                DatabaseManager._initialized.add(db_path)
     
     def get_connection(self):
-        """Get database connection with proper settings"""
-        conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
+        """Get the cached per-thread database connection (WAL, tuned PRAGMAs)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.executescript('''
+                PRAGMA journal_mode=WAL;
+                PRAGMA synchronous=NORMAL;
+                PRAGMA busy_timeout=5000;
+                PRAGMA temp_store=MEMORY;
+                PRAGMA cache_size=-20000;
+                PRAGMA mmap_size=268435456;
+            ''')
+            self._local.conn = conn
+            self._local.cursor = conn.cursor()
         return conn
     
+    def get_cursor(self) -> sqlite3.Cursor:
+        """Get the long-lived cursor bound to this thread's connection"""
+        self.get_connection()
+        return self._local.cursor
+    
     def init_database(self):
         """Initialize database with enhanced schema"""
         conn = self.get_connection()
@@ -99,8 +500,8 @@ class DatabaseManager:
             )
         ''')
         
-        # Enhanced interview results table
-        cursor.execute('''
+        # Enhanced interview results table (pass_status is derived, never written)
+        cursor.execute(f'''
             CREATE TABLE IF NOT EXISTS interview_results (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 user_id TEXT NOT NULL,
@@ -116,7 +517,8 @@ class DatabaseManager:
                 kreativitas REAL DEFAULT 0,
                 critical_thinking REAL DEFAULT 0,
                 total_score REAL DEFAULT 0,
-                pass_status BOOLEAN DEFAULT 0,
+                pass_status INTEGER GENERATED ALWAYS AS
+                    (CASE WHEN total_score >= {CONFIG.passing_score} THEN 1 ELSE 0 END) VIRTUAL,
                 interview_duration INTEGER,
                 questions_answered INTEGER,
                 interview_transcript TEXT,
@@ -162,7 +564,7 @@ class DatabaseManager:
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS job_market (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                job_title TEXT NOT NULL,
+                job_title TEXT NOT NULL UNIQUE,
                 category TEXT,
                 avg_salary_min INTEGER,
                 avg_salary_max INTEGER,
@@ -173,86 +575,111 @@ class DatabaseManager:
             )
         ''')
         
+        # Persisted SemanticCache entries (float32 unit embeddings), shared across sessions.
+        # Entries from before namespaces can't be attributed to a task/model, and the table
+        # is only a cache, so an old-layout table is simply recreated
+        columns = {row[1] for row in cursor.execute('PRAGMA table_info(semantic_cache)')}
+        if columns and 'namespace' not in columns:
+            cursor.execute('DROP TABLE semantic_cache')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS semantic_cache (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                namespace TEXT NOT NULL,
+                embedding BLOB NOT NULL,
+                response TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_semantic_cache_ns ON semantic_cache(namespace, id)')
+        
         # Create indexes for better performance
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_id ON interview_results(user_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_ir_user_created ON interview_results(user_id, created_at DESC)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_ir_pass ON interview_results(user_id, pass_status)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_session_id ON qa_history(session_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_created_at ON interview_results(created_at)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_qa_user_session ON qa_history(user_id, session_id)')
+        # Databases created before job_title was declared UNIQUE
+        cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_job_market_title ON job_market(job_title)')
+        
+        # Databases created before pass_status became a generated column still store it
+        cursor.execute("SELECT hidden FROM pragma_table_xinfo('interview_results') WHERE name = 'pass_status'")
+        if cursor.fetchone()['hidden'] == 0:
+            DatabaseManager._stored_pass_status.add(self.db_path)
         
-        conn.commit()
-        conn.close()
+        # Superseded by idx_ir_user_created
+        cursor.execute('DROP INDEX IF EXISTS idx_user_id')
+        cursor.execute('DROP INDEX IF EXISTS idx_created_at')
         
         # Seed initial job market data
         self.seed_job_market_data()
+        
+        # Refresh planner statistics so the composite indexes get picked
+        cursor.execute('ANALYZE')
     
     def seed_job_market_data(self):
         """Seed initial job market data"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        cursor.execute('SELECT COUNT(*) FROM job_market')
-        if cursor.fetchone()[0] == 0:
-            jobs = [
-                ("Software Engineer", "Teknologi", 12000000, 25000000, "Tinggi", 
-                 "Python,Java,JavaScript,SQL,Git", "Mengembangkan dan memelihara aplikasi software"),
-                ("Data Scientist", "Teknologi", 15000000, 30000000, "Sangat Tinggi",
-                 "Python,R,SQL,Machine Learning,Statistics", "Analisis data dan machine learning"),
-                ("Product Manager", "Manajemen", 15000000, 35000000, "Tinggi",
-                 "Product Strategy,Agile,Communication,Analytics", "Mengelola lifecycle produk"),
-                ("UX Designer", "Kreatif", 10000000, 20000000, "Sedang",
-                 "Figma,Adobe XD,User Research,Prototyping", "Desain pengalaman pengguna"),
-                ("Digital Marketing", "Marketing", 8000000, 18000000, "Tinggi",
-                 "SEO,SEM,Social Media,Content Marketing,Analytics", "Strategi marketing digital"),
-                ("Business Analyst", "Operasional", 10000000, 22000000, "Tinggi",
-                 "SQL,Excel,Data Analysis,Business Intelligence", "Analisis bisnis dan requirements"),
-                ("DevOps Engineer", "Teknologi", 14000000, 28000000, "Sangat Tinggi",
-                 "Docker,Kubernetes,AWS,CI/CD,Linux", "Automation dan infrastructure"),
-                ("HR Manager", "HR", 12000000, 25000000, "Sedang",
-                 "Recruitment,Employee Relations,HRIS,Labor Law", "Manajemen sumber daya manusia"),
-                ("Sales Manager", "Penjualan", 10000000, 30000000, "Tinggi",
-                 "Negotiation,CRM,Sales Strategy,Communication", "Manajemen tim penjualan"),
-                ("Financial Analyst", "Keuangan", 10000000, 22000000, "Sedang",
-                 "Financial Modeling,Excel,Accounting,Analysis", "Analisis keuangan perusahaan"),
-            ]
-            
+        jobs = [
+            ("Software Engineer", "Teknologi", 12000000, 25000000, "Tinggi", 
+             "Python,Java,JavaScript,SQL,Git", "Mengembangkan dan memelihara aplikasi software"),
+            ("Data Scientist", "Teknologi", 15000000, 30000000, "Sangat Tinggi",
+             "Python,R,SQL,Machine Learning,Statistics", "Analisis data dan machine learning"),
+            ("Product Manager", "Manajemen", 15000000, 35000000, "Tinggi",
+             "Product Strategy,Agile,Communication,Analytics", "Mengelola lifecycle produk"),
+            ("UX Designer", "Kreatif", 10000000, 20000000, "Sedang",
+             "Figma,Adobe XD,User Research,Prototyping", "Desain pengalaman pengguna"),
+            ("Digital Marketing", "Marketing", 8000000, 18000000, "Tinggi",
+             "SEO,SEM,Social Media,Content Marketing,Analytics", "Strategi marketing digital"),
+            ("Business Analyst", "Operasional", 10000000, 22000000, "Tinggi",
+             "SQL,Excel,Data Analysis,Business Intelligence", "Analisis bisnis dan requirements"),
+            ("DevOps Engineer", "Teknologi", 14000000, 28000000, "Sangat Tinggi",
+             "Docker,Kubernetes,AWS,CI/CD,Linux", "Automation dan infrastructure"),
+            ("HR Manager", "HR", 12000000, 25000000, "Sedang",
+             "Recruitment,Employee Relations,HRIS,Labor Law", "Manajemen sumber daya manusia"),
+            ("Sales Manager", "Penjualan", 10000000, 30000000, "Tinggi",
+             "Negotiation,CRM,Sales Strategy,Communication", "Manajemen tim penjualan"),
+            ("Financial Analyst", "Keuangan", 10000000, 22000000, "Sedang",
+             "Financial Modeling,Excel,Accounting,Analysis", "Analisis keuangan perusahaan"),
+        ]
+        
+        # Idempotent: rows already present are ignored via the UNIQUE job_title
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
             cursor.executemany('''
-                INSERT INTO job_market (job_title, category, avg_salary_min, avg_salary_max, 
-                                       demand_level, required_skills, description)
+                INSERT OR IGNORE INTO job_market (job_title, category, avg_salary_min, avg_salary_max, 
+                                                  demand_level, required_skills, description)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
             ''', jobs)
-            
-            conn.commit()
-        
-        conn.close()
+            cursor.execute('COMMIT')
+        except Exception:
+            cursor.execute('ROLLBACK')
+            raise
+    
+    def upsert_user_profile(self, user_id: str, profile_data: Dict):
+        """Insert or update user profile; raises on failure (safe off the script thread)"""
+        cursor = self.get_cursor()
+        
+        cv_hash = hashlib.blake2b(profile_data['cv_text'].encode('utf-8'), digest_size=16).hexdigest()
+        
+        cursor.execute(self.SQL_UPSERT_PROFILE, (
+            user_id,
+            profile_data.get('email'),
+            profile_data.get('full_name'),
+            profile_data['cv_text'],
+            cv_hash,
+            profile_data['target_job'],
+            profile_data.get('job_category'),
+            profile_data.get('experience_years', 0),
+            profile_data.get('education_level'),
+            json_dumps(profile_data.get('skills', [])),
+            json_dumps(profile_data.get('preferences', {}))
+        ))
     
     def save_user_profile(self, user_id: str, profile_data: Dict) -> bool:
         """Save or update user profile"""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            cv_hash = hashlib.md5(profile_data['cv_text'].encode()).hexdigest()
-            
-            cursor.execute('''
-                INSERT OR REPLACE INTO user_profiles 
-                (user_id, email, full_name, cv_text, cv_hash, target_job, job_category, 
-                 experience_years, education_level, skills, preferences, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-            ''', (
-                user_id,
-                profile_data.get('email'),
-                profile_data.get('full_name'),
-                profile_data['cv_text'],
-                cv_hash,
-                profile_data['target_job'],
-                profile_data.get('job_category'),
-                profile_data.get('experience_years', 0),
-                profile_data.get('education_level'),
-                json.dumps(profile_data.get('skills', [])),
-                json.dumps(profile_data.get('preferences', {}))
-            ))
-            
-            conn.commit()
-            conn.close()
+            self.upsert_user_profile(user_id, profile_data)
             return True
         except Exception as e:
             st.error(f"Error saving profile: {str(e)}")
@@ -261,34 +688,23 @@ class DatabaseManager:
     def save_interview_result(self, session_id: str, user_id: str, result_data: Dict) -> bool:
         """Save interview results with enhanced metrics"""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
+            cursor = self.get_cursor()
             
-            scores = result_data['scores']
-            total_score = sum(scores.values()) / len(scores)
-            pass_status = total_score >= CONFIG.passing_score
+            vals = _SCORE_GET({**_SCORE_DEFAULTS, **result_data['scores']})
+            total_score = math.fsum(vals) * _INV_N
+            params = (
+                user_id, session_id,
+                *_RESULT_GET({**_RESULT_DEFAULTS, **result_data}),
+                *vals, total_score
+            )
             
-            cursor.execute('''
-                INSERT INTO interview_results 
-                (user_id, session_id, job_title, difficulty_level, komunikasi, problem_solving, 
-                 leadership, teamwork, pengetahuan_teknis, adaptabilitas, kreativitas, 
-                 critical_thinking, total_score, pass_status, interview_duration, 
-                 questions_answered, interview_transcript, detailed_feedback, recommendations)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                user_id, session_id, result_data['job_title'], result_data.get('difficulty'),
-                scores.get('komunikasi', 0), scores.get('problem_solving', 0),
-                scores.get('leadership', 0), scores.get('teamwork', 0),
-                scores.get('pengetahuan_teknis', 0), scores.get('adaptabilitas', 0),
-                scores.get('kreativitas', 0), scores.get('critical_thinking', 0),
-                total_score, pass_status, result_data.get('duration', 0),
-                result_data.get('questions_answered', 0),
-                result_data.get('transcript'), result_data.get('detailed_feedback'),
-                result_data.get('recommendations')
-            ))
+            if self.db_path in DatabaseManager._stored_pass_status:
+                cursor.execute(self.SQL_INSERT_RESULT_STORED_PASS,
+                               params + (total_score >= CONFIG.passing_score,))
+            else:
+                cursor.execute(self.SQL_INSERT_RESULT, params)
             
-            conn.commit()
-            conn.close()
+            self.invalidate(user_id)
             return True
         except Exception as e:
             st.error(f"Error saving interview result: {str(e)}")
@@ -296,48 +712,54 @@ class DatabaseManager:
     
     def save_qa_pair(self, session_id: str, qa_data: Dict) -> bool:
         """Save question-answer pair with metadata"""
+        return self.save_qa_pairs_bulk(session_id, [qa_data])
+    
+    def save_qa_pairs_bulk(self, session_id: str, qa_list: List[Dict]) -> bool:
+        """Save many question-answer pairs in a single transaction"""
+        if not qa_list:
+            return True
+        
+        conn = self.get_connection()
+        cursor = self.get_cursor()
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO qa_history 
-                (user_id, session_id, question_id, category, question, answer, 
-                 answer_length, response_time, score, feedback)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
+            cursor.execute('BEGIN')
+            cursor.executemany(self.SQL_INSERT_QA, [(
                 qa_data['user_id'], session_id, qa_data.get('question_id'),
                 qa_data.get('category'), qa_data['question'], qa_data['answer'],
                 len(qa_data['answer']), qa_data.get('response_time', 0),
                 qa_data.get('score', 0), qa_data.get('feedback', '')
-            ))
-            
-            conn.commit()
-            conn.close()
+            ) for qa_data in qa_list])
+            cursor.execute('COMMIT')
             return True
         except Exception as e:
+            if conn.in_transaction:
+                cursor.execute('ROLLBACK')
             st.error(f"Error saving Q&A: {str(e)}")
             return False
     
-    def get_user_history(self, user_id: str, limit: int = 10) -> List[Dict]:
-        """Get user interview history with rich data"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT * FROM interview_results 
-            WHERE user_id = ? 
-            ORDER BY created_at DESC
-            LIMIT ?
-        ''', (user_id, limit))
-        
-        results = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        
-        return results
+    def get_user_history(self, user_id: str, limit: int = 10,
+                         columns: Tuple[str, ...] = _HISTORY_DEFAULT_COLUMNS) -> List[Dict]:
+        """Get user interview history, selecting only the requested columns"""
+        unknown = set(columns) - _HISTORY_COLUMNS
+        if unknown:
+            raise ValueError(f"Unknown interview_results columns: {sorted(unknown)}")
+        return _fetch_history(self.db_path, user_id, self._data_version(user_id), limit, tuple(columns),
+                              self.get_connection())
+    
+    def get_history(self, user_id: str, pass_only: Optional[bool] = None, job_title: Optional[str] = None,
+                    difficulty: Optional[str] = None, limit: int = 50, offset: int = 0,
+                    columns: Tuple[str, ...] = _HISTORY_DETAIL_COLUMNS) -> List[Dict]:
+        """Get one page of user interview history, filtered and ordered in SQL"""
+        unknown = set(columns) - _HISTORY_COLUMNS
+        if unknown:
+            raise ValueError(f"Unknown interview_results columns: {sorted(unknown)}")
+        return _fetch_history_page(self.db_path, user_id, self._data_version(user_id), pass_only, job_title,
+                                   difficulty, limit, offset, tuple(columns), self.get_connection())
     
     def get_user_progress(self, user_id: str, metric: Optional[str] = None) -> pd.DataFrame:
         """Get user progress over time"""
+        import pandas as pd
+        
         conn = self.get_connection()
         
         if metric:
@@ -347,7 +769,8 @@ class DatabaseManager:
                 WHERE user_id = ? AND metric_name = ?
                 ORDER BY recorded_at ASC
             '''
-            df = pd.read_sql_query(query, conn, params=(user_id, metric))
+            df = pd.read_sql_query(query, conn, params=(user_id, metric), parse_dates=['recorded_at'],
+                                   dtype=_PROGRESS_DTYPES)
         else:
             query = '''
                 SELECT metric_name, metric_value, improvement_rate, recorded_at
@@ -355,114 +778,81 @@ class DatabaseManager:
                 WHERE user_id = ?
                 ORDER BY recorded_at ASC
             '''
-            df = pd.read_sql_query(query, conn, params=(user_id,))
+            df = pd.read_sql_query(query, conn, params=(user_id,), parse_dates=['recorded_at'],
+                                   dtype=_PROGRESS_DTYPES)
         
-        conn.close()
         return df
     
-    def get_analytics_data(self, user_id: str) -> Dict:
+    def get_score_series(self, user_id: str, limit: int = 20):
+        """Get (dates, total_scores) numpy arrays of recent interviews, newest first"""
+        return _fetch_score_series(self.db_path, user_id, self._data_version(user_id), limit, self.get_connection())
+    
+    def get_analytics_data(self, user_id: str) -> Analytics:
         """Get comprehensive analytics for user"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        # Get total interviews
-        cursor.execute('SELECT COUNT(*) FROM interview_results WHERE user_id = ?', (user_id,))
-        total_interviews = cursor.fetchone()[0]
-        
-        # Get average score
-        cursor.execute('SELECT AVG(total_score) FROM interview_results WHERE user_id = ?', (user_id,))
-        avg_score = cursor.fetchone()[0] or 0
-        
-        # Get improvement rate
+        return _fetch_analytics(self.db_path, user_id, self._data_version(user_id), self.get_connection())
+    
+    def get_job_market(self) -> List[Dict]:
+        """Get all job market entries"""
+        return _fetch_job_market(self.db_path, self.get_connection())
+    
+    def get_history_summary(self, user_id: str) -> HistorySummary:
+        """Get summary stats and filter options for the detailed history view"""
+        return _fetch_history_summary(self.db_path, user_id, self._data_version(user_id),
+                                      self.get_connection())
+    
+    def load_semantic_cache(self, limit: int) -> List[Tuple[str, bytes, str]]:
+        """Get the newest persisted (namespace, embedding, response) rows per namespace, oldest first"""
+        cursor = self.get_cursor()
         cursor.execute('''
-            SELECT total_score, created_at 
-            FROM interview_results 
-            WHERE user_id = ? 
-            ORDER BY created_at ASC
-        ''', (user_id,))
-        scores = cursor.fetchall()
-        
-        improvement_rate = 0
-        if len(scores) >= 2:
-            first_score = scores[0][0]
-            last_score = scores[-1][0]
-            improvement_rate = ((last_score - first_score) / first_score) * 100 if first_score > 0 else 0
-        
-        # Get strongest and weakest areas
+            SELECT namespace, embedding, response FROM (
+                SELECT id, namespace, embedding, response,
+                       ROW_NUMBER() OVER (PARTITION BY namespace ORDER BY id DESC) AS rn
+                FROM semantic_cache
+            ) WHERE rn <= ? ORDER BY id ASC
+        ''', (limit,))
+        return [(row['namespace'], row['embedding'], row['response']) for row in cursor.fetchall()]
+    
+    def save_semantic_cache_entry(self, namespace: str, embedding: bytes, response: str, max_entries: int):
+        """Persist one semantic cache entry, keeping the newest max_entries per namespace; raises on failure"""
+        cursor = self.get_cursor()
+        cursor.execute('INSERT INTO semantic_cache (namespace, embedding, response) VALUES (?, ?, ?)',
+                       (namespace, embedding, response))
         cursor.execute('''
-            SELECT AVG(komunikasi) as kom, AVG(problem_solving) as ps, 
-                   AVG(leadership) as lead, AVG(teamwork) as team,
-                   AVG(pengetahuan_teknis) as tech, AVG(adaptabilitas) as adapt
-            FROM interview_results WHERE user_id = ?
-        ''', (user_id,))
-        
-        avgs = cursor.fetchone()
-        areas = {
-            'Komunikasi': avgs[0] or 0,
-            'Problem Solving': avgs[1] or 0,
-            'Leadership': avgs[2] or 0,
-            'Teamwork': avgs[3] or 0,
-            'Pengetahuan Teknis': avgs[4] or 0,
-            'Adaptabilitas': avgs[5] or 0
-        }
-        
-        strongest = max(areas.items(), key=lambda x: x[1]) if areas else ('N/A', 0)
-        weakest = min(areas.items(), key=lambda x: x[1]) if areas else ('N/A', 0)
-        
-        conn.close()
-        
-        return {
-            'total_interviews': total_interviews,
-            'avg_score': round(avg_score, 2),
-            'improvement_rate': round(improvement_rate, 2),
-            'strongest_area': strongest,
-            'weakest_area': weakest,
-            'category_scores': areas
-        }
+            DELETE FROM semantic_cache WHERE namespace = ? AND id <= (
+                SELECT id FROM semantic_cache WHERE namespace = ?
+                ORDER BY id DESC LIMIT 1 OFFSET ?
+            )
+        ''', (namespace, namespace, max_entries))
+    
+    def _data_version(self, user_id: str) -> int:
+        """Current data version of user_id, passed to the cached per-user reads"""
+        return DatabaseManager._data_versions.get((self.db_path, user_id), 0)
+    
+    def invalidate(self, user_id: str):
+        """Retire user_id's cached history/analytics; other users' entries stay cached"""
+        # A fresh version misses the cache; stale entries simply age out with the ttl
+        DatabaseManager._data_versions[(self.db_path, user_id)] = next(DatabaseManager._version_counter)
+
+@st.cache_resource
+def get_db() -> DatabaseManager:
+    """Process-wide DatabaseManager, reused across Streamlit reruns"""
+    return DatabaseManager()
+
+@st.cache_resource
+def _db_executor() -> ThreadPoolExecutor:
+    # Single worker: background writes are serialized on one connection
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix='db')
 
 # ============================
 # AI/LLM INTEGRATION (Enhanced)
 # ============================
 
-class LLMService:
-    """Enhanced LLM service with better prompting and error handling"""
-    
-    def __init__(self, model: str = "gpt-4o"):
-        self.model = model
-        self.max_retries = 3
-        self.timeout = 60
-    
-    def _call_openai(self, messages: List[Dict], temperature: float = 0.7) -> Optional[str]:
-        """Call OpenAI API with retry logic"""
-        try:
-            import openai
-            openai.api_key = st.secrets.get("OPENAI_API_KEY", os.getenv("OPENAI_API_KEY"))
-            
-            response = openai.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=2000
-            )
-            
-            return response.choices[0].message.content
-        except Exception as e:
-            st.error(f"OpenAI API Error: {str(e)}")
-            return None
-    
-    def analyze_cv_and_generate_questions(self, cv_text: str, target_job: str, 
-                                         difficulty: str = "Sedang") -> Dict:
-        """Generate tailored interview questions based on CV and job"""
-        
-        prompt = f"""Anda adalah HR Expert dengan 15+ tahun pengalaman dalam recruitment dan interview.
+# Static instructions go in the system message and per-request data at the tail
+# of the user message, so the shared prefix is eligible for provider prompt caching.
 
-**TUGAS**: Analisis CV kandidat dan buat pertanyaan interview yang mendalam dan relevan.
-
-**CV KANDIDAT**:
-{cv_text[:1500]}...
+SYSTEM_PROMPT_QUESTIONS = """Anda adalah HR Expert dengan 15+ tahun pengalaman dalam recruitment dan interview.
 
-**POSISI TARGET**: {target_job}
-**TINGKAT KESULITAN**: {difficulty}
+**TUGAS**: Analisis CV kandidat dan buat pertanyaan interview yang mendalam dan relevan.
 
 **INSTRUKSI**:
 1. Analisis mendalam kesesuaian kandidat dengan posisi
@@ -470,7 +860,7 @@ class LLMService:
 3. Buat 8-10 pertanyaan yang:
    - Spesifik untuk pengalaman kandidat
    - Menguji kompetensi teknis dan soft skills
-   - Sesuai tingkat kesulitan: {difficulty}
+   - Sesuai TINGKAT KESULITAN yang diminta
    - Memicu jawaban detail dan refleksi
 
 **KATEGORI PERTANYAAN**:
@@ -484,58 +874,33 @@ class LLMService:
 - Critical Thinking & Decision Making
 
 **FORMAT OUTPUT (JSON)**:
-{{
-    "analysis": {{
+{
+    "analysis": {
         "overall_fit": "percentage dan penjelasan",
         "strengths": ["kekuatan 1", "kekuatan 2", ...],
         "gaps": ["gap 1", "gap 2", ...],
         "recommendation": "rekomendasi singkat"
-    }},
+    },
     "questions": [
-        {{
+        {
             "id": 1,
             "category": "komunikasi",
             "question": "pertanyaan spesifik...",
             "context": "kenapa pertanyaan ini penting",
             "expected_answer_points": ["poin 1", "poin 2", ...],
             "difficulty": "medium"
-        }},
+        },
         ...
     ]
-}}
+}
 
-**PENTING**: 
+**PENTING**:
 - Pertanyaan harus SANGAT spesifik untuk kandidat ini
 - Hindari pertanyaan generik/template
 - Gunakan bahasa Indonesia profesional
 - Sesuaikan dengan industri dan level posisi"""
 
-        messages = [{"role": "user", "content": prompt}]
-        response = self._call_openai(messages, temperature=0.8)
-        
-        if not response:
-            return self._get_fallback_questions(target_job)
-        
-        try:
-            return json.loads(response)
-        except:
-            return self._get_fallback_questions(target_job)
-    
-    def evaluate_answer(self, question: Dict, answer: str, cv_context: str) -> Dict:
-        """Evaluate individual answer with detailed feedback"""
-        
-        prompt = f"""Sebagai expert interviewer, evaluasi jawaban kandidat berikut:
-
-**KONTEKS CV**: {cv_context[:300]}...
-
-**PERTANYAAN** ({question['category']}):
-{question['question']}
-
-**POIN YANG DIHARAPKAN**:
-{json.dumps(question.get('expected_answer_points', []), indent=2)}
-
-**JAWABAN KANDIDAT**:
-{answer}
+SYSTEM_PROMPT_ANSWER_EVAL = """Sebagai expert interviewer, evaluasi jawaban kandidat yang diberikan.
 
 **EVALUASI**:
 1. Skor (0-100): Berdasarkan relevansi, kedalaman, struktur, dan contoh konkret
@@ -544,46 +909,16 @@ class LLMService:
 4. Improvement tips: Saran spesifik untuk jawaban lebih baik
 
 **FORMAT JSON**:
-{{
+{
     "score": 85,
     "feedback": "feedback detail...",
     "strengths": ["poin kuat 1", "poin kuat 2"],
     "improvements": ["area improvement 1", "area improvement 2"],
     "missing_points": ["poin yang terlewat"],
     "better_answer_example": "contoh jawaban yang lebih baik..."
-}}"""
+}"""
 
-        messages = [{"role": "user", "content": prompt}]
-        response = self._call_openai(messages, temperature=0.5)
-        
-        try:
-            return json.loads(response)
-        except:
-            return {
-                "score": 70,
-                "feedback": "Jawaban cukup baik namun bisa lebih detail.",
-                "strengths": ["Menjawab pertanyaan"],
-                "improvements": ["Tambahkan contoh konkret", "Jelaskan lebih detail"],
-                "missing_points": [],
-                "better_answer_example": ""
-            }
-    
-    def evaluate_full_interview(self, questions: List[Dict], answers: List[str], 
-                               cv_text: str, target_job: str) -> Dict:
-        """Comprehensive interview evaluation"""
-        
-        qa_text = "\n\n".join([
-            f"Q{i+1} [{q['category']}]: {q['question']}\nA{i+1}: {a}"
-            for i, (q, a) in enumerate(zip(questions, answers))
-        ])
-        
-        prompt = f"""Sebagai Senior HR Evaluator, berikan evaluasi komprehensif interview ini:
-
-**TARGET POSISI**: {target_job}
-**CV**: {cv_text[:500]}...
-
-**INTERVIEW TRANSCRIPT**:
-{qa_text}
+SYSTEM_PROMPT_FULL_EVAL = """Sebagai Senior HR Evaluator, berikan evaluasi komprehensif interview yang diberikan.
 
 **EVALUASI KOMPREHENSIF**:
 
@@ -609,8 +944,8 @@ class LLMService:
    - Development areas prioritas
 
 **FORMAT JSON**:
-{{
-    "scores": {{
+{
+    "scores": {
         "komunikasi": 85,
         "problem_solving": 78,
         "leadership": 82,
@@ -619,8 +954,8 @@ class LLMService:
         "adaptabilitas": 80,
         "kreativitas": 77,
         "critical_thinking": 81
-    }},
-    "category_feedback": {{
+    },
+    "category_feedback": {
         "komunikasi": "feedback spesifik...",
         "problem_solving": "feedback spesifik...",
         "leadership": "feedback spesifik...",
@@ -629,51 +964,25 @@ class LLMService:
         "adaptabilitas": "feedback spesifik...",
         "kreativitas": "feedback spesifik...",
         "critical_thinking": "feedback spesifik..."
-    }},
+    },
     "overall_assessment": "evaluasi keseluruhan...",
     "strengths": ["kekuatan utama 1", "kekuatan utama 2", ...],
     "weaknesses": ["kelemahan yang perlu diperbaiki", ...],
     "red_flags": ["concern jika ada"],
-    "recommendation": {{
+    "recommendation": {
         "decision": "Hire/Don't Hire/Maybe",
         "confidence": "70%",
         "reasoning": "alasan keputusan...",
         "next_steps": ["langkah 1", "langkah 2"]
-    }},
-    "development_plan": {{
+    },
+    "development_plan": {
         "priority_areas": ["area 1", "area 2"],
         "suggested_actions": ["aksi 1", "aksi 2"],
         "timeline": "3-6 bulan"
-    }}
-}}"""
-
-        messages = [{"role": "user", "content": prompt}]
-        response = self._call_openai(messages, temperature=0.6)
-        
-        try:
-            return json.loads(response)
-        except:
-            return self._get_fallback_evaluation()
-    
-    def get_job_recommendations(self, cv_text: str, scores: Dict, 
-                               job_market_data: List[Dict]) -> List[Dict]:
-        """AI-powered job matching and recommendations"""
-        
-        job_list = "\n".join([
-            f"- {job['job_title']}: {job['description']} (Skills: {job['required_skills']})"
-            for job in job_market_data[:15]
-        ])
-        
-        prompt = f"""Sebagai Career Advisor AI, analisis profil kandidat dan rekomendasikan pekerjaan terbaik:
-
-**PROFIL KANDIDAT**:
-CV: {cv_text[:800]}...
-
-**SKOR INTERVIEW**:
-{json.dumps(scores, indent=2)}
+    }
+}"""
 
-**AVAILABLE JOBS**:
-{job_list}
+SYSTEM_PROMPT_JOB_RECS = """Sebagai Career Advisor AI, analisis profil kandidat dan rekomendasikan pekerjaan terbaik dari daftar AVAILABLE JOBS.
 
 **TUGAS**:
 1. Analisis kesesuaian kandidat dengan setiap pekerjaan
@@ -682,9 +991,9 @@ CV: {cv_text[:800]}...
 4. Berikan career path suggestions
 
 **FORMAT JSON**:
-{{
+{
     "recommendations": [
-        {{
+        {
             "job_title": "Software Engineer",
             "match_percentage": 85,
             "match_reasons": ["alasan 1", "alasan 2"],
@@ -692,306 +1001,818 @@ CV: {cv_text[:800]}...
             "salary_range": "Rp 12.000.000 - Rp 25.000.000",
             "growth_potential": "Tinggi",
             "difficulty_to_get": "Sedang"
-        }},
+        },
         ...
     ],
-    "career_path": {{
+    "career_path": {
         "short_term": "posisi entry/mid level",
         "mid_term": "posisi setelah 2-3 tahun",
         "long_term": "posisi ideal 5+ tahun"
-    }},
-    "skill_development": {{
+    },
+    "skill_development": {
         "must_have": ["skill critical 1", ...],
         "nice_to_have": ["skill bonus", ...],
         "learning_resources": ["resource 1", ...]
-    }}
-}}"""
+    }
+}"""
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+# CV excerpt budgets per prompt, in tokens (~4 characters each without tiktoken)
+CV_TOKENS_QUESTIONS = 375
+CV_TOKENS_ANSWER_EVAL = 75
+CV_TOKENS_FULL_EVAL = 125
+CV_TOKENS_JOB_RECS = 200
+_CHARS_PER_TOKEN = 4
+
+@functools.lru_cache(maxsize=4)
+def _get_token_encoding(model: str):
+    try:
+        import tiktoken
+        return tiktoken.encoding_for_model(model)
+    except Exception:
+        return None
+
+@functools.lru_cache(maxsize=64)
+def _trim_tokens(text: str, max_tokens: int, model: str) -> str:
+    """First max_tokens tokens of text (character budget if tiktoken is unavailable)"""
+    enc = _get_token_encoding(model)
+    if enc is None:
+        return text[:max_tokens * _CHARS_PER_TOKEN]
+    ids = enc.encode(text)
+    return enc.decode(ids[:max_tokens]) if len(ids) > max_tokens else text
+
+def _parse_llm_json(response: Optional[str]):
+    """Parse model JSON output, repairing near-miss JSON if json_repair is installed"""
+    if not response:
+        return None
+    try:
+        return json_loads(response)
+    except json.JSONDecodeError:
+        if repair_json is None:
+            return None
+        try:
+            return json_loads(repair_json(response))
+        except json.JSONDecodeError:
+            return None
+
+def _digest(text: str) -> str:
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+# Static system prompts are hashed once here instead of on every cache-key build
+_SYSTEM_PROMPT_DIGESTS = {
+    prompt: _digest(prompt) for prompt in (
+        SYSTEM_PROMPT_QUESTIONS, SYSTEM_PROMPT_ANSWER_EVAL, SYSTEM_PROMPT_FULL_EVAL,
+        SYSTEM_PROMPT_JOB_RECS
+    )
+}
+
+def _messages_key(messages: List[Dict]) -> str:
+    """Stable digest of a chat message list"""
+    parts = []
+    for m in messages:
+        content = m['content']
+        if m['role'] == 'system':
+            content = _SYSTEM_PROMPT_DIGESTS.get(content) or _digest(content)
+        parts.append(f"{m['role']}\x00{content}")
+    return _digest("\x01".join(parts))
+
+@st.cache_data(ttl=86400, show_spinner=False)
+def _cached_completion(model: str, messages_key: str, temperature: float,
+                       _llm: LLMService, _messages: List[Dict], _semantic_task: Optional[str] = None) -> str:
+    """Exact-match completion cache; failures raise and are therefore not cached"""
+    # Only misses reach the semantic cache, so exact hits never pay for an embeddings request
+    if _semantic_task is not None:
+        return _llm._semantic_completion(_messages, temperature, _semantic_task)
+    return _llm._create_completion(_messages, temperature)
+
+# A complete "category": <number> pair inside the streamed "scores" object
+_SCORE_FIELD_RE = re.compile(r'"(' + '|'.join(_SCORE_KEYS) + r')"\s*:\s*(\d+(?:\.\d+)?)\s*[,}\n]')
+
+def _score_stream_handler(on_score: Callable[[str, float], None]) -> Callable[[str], None]:
+    """Turn a buffer-so-far callback into one on_score call per newly completed score"""
+    seen = set()
+    state = {'pos': 0}
+    
+    def on_delta(buffer: str):
+        for match in _SCORE_FIELD_RE.finditer(buffer, state['pos']):
+            state['pos'] = match.end()
+            key = match.group(1)
+            if key not in seen:
+                seen.add(key)
+                on_score(key, float(match.group(2)))
+    
+    return on_delta
+
+# The (possibly unterminated) overall_assessment string, and the completed items
+# of the strengths/weaknesses arrays, inside the streamed evaluation
+_ASSESSMENT_FIELD_RE = re.compile(r'"overall_assessment"\s*:\s*"((?:[^"\\]|\\.)*)')
+_LIST_FIELD_RE = re.compile(r'"(strengths|weaknesses)"\s*:\s*\[((?:\s*"(?:[^"\\]|\\.)*"\s*,?)*)')
+_LIST_ITEM_RE = re.compile(r'"((?:[^"\\]|\\.)*)"')
+
+def _json_string_fragment(raw: str) -> str:
+    """Decode the body of a JSON string literal that may still be streaming"""
+    # Retry without a trailing half-received \uXXXX escape
+    for end in (len(raw), raw.rfind('\\')):
+        try:
+            return json.loads(f'"{raw[:end]}"', strict=False)
+        except ValueError:
+            continue
+    return raw
+
+def _text_stream_handler(on_text: Callable[[str, Union[str, List[str]]], None]) -> Callable[[str], None]:
+    """Turn a buffer-so-far callback into on_text calls as the assessment and strengths/weaknesses grow"""
+    sizes = {}
+    
+    def on_delta(buffer: str):
+        match = _ASSESSMENT_FIELD_RE.search(buffer)
+        if match and len(match.group(1)) > sizes.get('overall_assessment', 0):
+            sizes['overall_assessment'] = len(match.group(1))
+            on_text('overall_assessment', _json_string_fragment(match.group(1)))
+        
+        for match in _LIST_FIELD_RE.finditer(buffer):
+            field, items = match.group(1), _LIST_ITEM_RE.findall(match.group(2))
+            if len(items) > sizes.get(field, 0):
+                sizes[field] = len(items)
+                on_text(field, [_json_string_fragment(item) for item in items])
+    
+    return on_delta
+
+def _combine_stream_handlers(*handlers: Optional[Callable[[str], None]]) -> Optional[Callable[[str], None]]:
+    """One on_delta feeding the buffer to every non-None handler, or None if there are none"""
+    handlers = [handler for handler in handlers if handler is not None]
+    if not handlers:
+        return None
+    
+    def on_delta(buffer: str):
+        for handler in handlers:
+            handler(buffer)
+    
+    return on_delta
+
+class SemanticCache:
+    """Nearest-neighbour cache of LLM responses keyed by unit-norm prompt embeddings"""
+    
+    # Entries are partitioned by namespace (task + model): a lookup only ever compares
+    # against prompts of the same kind, whatever the similarity threshold
+    
+    def __init__(self, threshold: float = 0.97, max_entries: int = 1000,
+                 db: Optional[DatabaseManager] = None):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._db = db
+        self._vectors: Dict[str, object] = {}
+        self._responses: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+        if db is not None:
+            self._load()
+    
+    def _load(self):
+        """Warm the cache from entries persisted by earlier sessions"""
+        import numpy as np
+        
+        try:
+            rows = self._db.load_semantic_cache(self.max_entries)
+        except Exception:
+            return
+        blobs = {}
+        for namespace, blob, response in rows:
+            blobs.setdefault(namespace, []).append(np.frombuffer(blob, dtype=np.float32))
+            self._responses.setdefault(namespace, []).append(response)
+        for namespace, vectors in blobs.items():
+            self._vectors[namespace] = np.vstack(vectors)
+    
+    def lookup(self, namespace: str, vector) -> Optional[str]:
+        """Return the namespace's cached response whose prompt is most similar, if above threshold"""
+        import numpy as np
+        
+        with self._lock:
+            responses = self._responses.get(namespace)
+            if not responses:
+                return None
+            sims = self._vectors[namespace] @ vector
+            best = int(np.argmax(sims))
+            return responses[best] if sims[best] >= self.threshold else None
+    
+    def add(self, namespace: str, vector, response: str):
+        """Store a response, evicting the namespace's oldest entry past max_entries"""
+        import numpy as np
+        
+        with self._lock:
+            row = vector[np.newaxis, :]
+            vectors = self._vectors.get(namespace)
+            self._vectors[namespace] = row if vectors is None else np.vstack([vectors, row])
+            responses = self._responses.setdefault(namespace, [])
+            responses.append(response)
+            if len(responses) > self.max_entries:
+                self._vectors[namespace] = self._vectors[namespace][1:]
+                responses.pop(0)
+        
+        if self._db is not None:
+            try:
+                self._db.save_semantic_cache_entry(
+                    namespace, vector.astype(np.float32).tobytes(), response, self.max_entries)
+            except Exception:
+                # Persistence is best-effort; the in-memory entry still serves hits
+                pass
+
+@st.cache_resource
+def get_semantic_cache() -> SemanticCache:
+    return SemanticCache(db=get_db())
+
+@st.cache_resource
+def _llm_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix='llm')
+
+# Canned responses used when the API is unavailable. Questions containing
+# {target_job} are formatted per call; everything else is shared as-is.
+_FALLBACK_QUESTIONS = {
+    "analysis": {
+        "overall_fit": "75% - Profil cukup sesuai dengan posisi",
+        "strengths": ["Pengalaman relevan", "Skill set memadai"],
+        "gaps": ["Perlu lebih detail tentang project specific"],
+        "recommendation": "Kandidat potensial untuk dipertimbangkan"
+    },
+    "questions": [
+        {
+            "id": 1,
+            "category": "komunikasi",
+            "question": "Ceritakan pengalaman Anda dalam mempresentasikan ide kompleks kepada stakeholder non-teknis?",
+            "context": "Mengukur kemampuan komunikasi efektif",
+            "expected_answer_points": ["Situasi spesifik", "Approach yang digunakan", "Hasil"],
+            "difficulty": "medium"
+        },
+        {
+            "id": 2,
+            "category": "problem_solving",
+            "question": "Jelaskan masalah teknis tersulit yang pernah Anda hadapi dan bagaimana Anda menyelesaikannya?",
+            "context": "Menguji analytical dan problem-solving skills",
+            "expected_answer_points": ["Kompleksitas masalah", "Proses analisis", "Solusi", "Learning"],
+            "difficulty": "hard"
+        },
+        {
+            "id": 3,
+            "category": "leadership",
+            "question": "Untuk posisi {target_job}, bagaimana Anda akan memimpin tim dalam menghadapi deadline ketat?",
+            "context": "Menguji leadership style dan pressure handling",
+            "expected_answer_points": ["Leadership approach", "Prioritization", "Team motivation"],
+            "difficulty": "medium"
+        },
+        {
+            "id": 4,
+            "category": "teamwork",
+            "question": "Ceritakan pengalaman ketika Anda harus bekerja dengan rekan tim yang sulit. Bagaimana Anda menanganinya?",
+            "context": "Mengukur interpersonal skills dan conflict resolution",
+            "expected_answer_points": ["Situasi", "Approach", "Resolusi", "Learning"],
+            "difficulty": "medium"
+        },
+        {
+            "id": 5,
+            "category": "pengetahuan_teknis",
+            "question": "Jelaskan teknologi atau metodologi terkini yang relevan untuk posisi {target_job}. Bagaimana Anda mengimplementasikannya?",
+            "context": "Menguji technical knowledge dan up-to-date awareness",
+            "expected_answer_points": ["Technology understanding", "Implementation experience", "Best practices"],
+            "difficulty": "hard"
+        },
+        {
+            "id": 6,
+            "category": "adaptabilitas",
+            "question": "Ceritakan situasi ketika Anda harus belajar skill baru dengan cepat. Apa strategi Anda?",
+            "context": "Mengukur learning agility",
+            "expected_answer_points": ["Learning approach", "Resources used", "Application", "Outcome"],
+            "difficulty": "medium"
+        },
+        {
+            "id": 7,
+            "category": "kreativitas",
+            "question": "Jelaskan ide inovatif yang pernah Anda usulkan atau implementasikan. Apa impact-nya?",
+            "context": "Menguji creative thinking dan innovation",
+            "expected_answer_points": ["Ide", "Implementation", "Challenges", "Impact"],
+            "difficulty": "medium"
+        },
+        {
+            "id": 8,
+            "category": "critical_thinking",
+            "question": "Bagaimana Anda membuat keputusan penting ketika data yang tersedia terbatas atau ambigu?",
+            "context": "Menguji decision making under uncertainty",
+            "expected_answer_points": ["Decision framework", "Risk assessment", "Validation", "Learning"],
+            "difficulty": "hard"
+        }
+    ]
+}
+_FALLBACK_JOB_QUESTIONS = tuple(i for i, q in enumerate(_FALLBACK_QUESTIONS['questions'])
+                                if '{target_job}' in q['question'])
+
+_FALLBACK_ANSWER_EVALUATION = {
+    "score": 70,
+    "feedback": "Jawaban cukup baik namun bisa lebih detail.",
+    "strengths": ["Menjawab pertanyaan"],
+    "improvements": ["Tambahkan contoh konkret", "Jelaskan lebih detail"],
+    "missing_points": [],
+    "better_answer_example": ""
+}
+
+_FALLBACK_EVALUATION = {
+    "scores": {
+        "komunikasi": 75,
+        "problem_solving": 72,
+        "leadership": 70,
+        "teamwork": 78,
+        "pengetahuan_teknis": 68,
+        "adaptabilitas": 74,
+        "kreativitas": 71,
+        "critical_thinking": 73
+    },
+    "category_feedback": {
+        "komunikasi": "Komunikasi cukup jelas, perlu lebih terstruktur",
+        "problem_solving": "Menunjukkan kemampuan analitis yang baik",
+        "leadership": "Potensi leadership terlihat, perlu lebih banyak contoh",
+        "teamwork": "Kemampuan kolaborasi sangat baik",
+        "pengetahuan_teknis": "Perlu memperdalam pengetahuan teknis",
+        "adaptabilitas": "Menunjukkan fleksibilitas yang memadai",
+        "kreativitas": "Ide-ide cukup inovatif",
+        "critical_thinking": "Analytical thinking cukup baik"
+    },
+    "overall_assessment": "Kandidat menunjukkan performa yang cukup baik dengan potensi untuk berkembang. Beberapa area memerlukan peningkatan.",
+    "strengths": ["Komunikasi yang baik", "Kemampuan teamwork", "Adaptabilitas"],
+    "weaknesses": ["Pengetahuan teknis perlu diperdalam", "Leadership presence bisa lebih kuat"],
+    "red_flags": [],
+    "recommendation": {
+        "decision": "Maybe",
+        "confidence": "65%",
+        "reasoning": "Kandidat potensial namun perlu evaluasi lebih lanjut pada aspek teknis",
+        "next_steps": ["Technical deep-dive", "Meet the team", "Case study"]
+    },
+    "development_plan": {
+        "priority_areas": ["Pengetahuan Teknis", "Leadership Skills"],
+        "suggested_actions": [
+            "Ikuti training/sertifikasi teknis",
+            "Ambil leadership role dalam project",
+            "Pelajari best practices industri"
+        ],
+        "timeline": "3-6 bulan"
+    }
+}
+
+class LLMService:
+    """Enhanced LLM service with better prompting and error handling"""
+    
+    def __init__(self, model: str = "gpt-4o"):
+        self.model = model
+        self.max_retries = 3
+        self.timeout = 60
+        
+        # One client per service: key lookup happens once and the HTTP pool is reused
+        self._client = None
+        self._client_error = None
+        try:
+            import httpx
+            import openai
+            # Idle connections outlive the time spent typing an answer (httpx drops them
+            # after 5s by default), so the next call skips the TCP/TLS handshake
+            limits = httpx.Limits(max_connections=32, max_keepalive_connections=16,
+                                  keepalive_expiry=120)
+            self._client = openai.OpenAI(
+                api_key=st.secrets.get("OPENAI_API_KEY", os.getenv("OPENAI_API_KEY")),
+                timeout=self.timeout,
+                max_retries=self.max_retries,
+                http_client=openai.DefaultHttpxClient(limits=limits)
+            )
+        except Exception as e:
+            self._client_error = e
+    
+    def _call_openai(self, messages: List[Dict], temperature: float = 0.7,
+                     on_delta: Optional[Callable[[str], None]] = None,
+                     semantic_task: Optional[str] = None) -> Optional[str]:
+        """Call OpenAI API with retry logic (non-streamed responses cached by exact prompt)"""
+        if self._client is None:
+            st.error(f"OpenAI API Error: {str(self._client_error)}")
+            return None
+        
+        try:
+            # Streaming callbacks write to page elements, which st.cache_data would record
+            # and fail to replay on a hit, so streamed calls always go to the API
+            if on_delta is not None:
+                return self._create_completion(messages, temperature, on_delta)
+            return _cached_completion(self.model, _messages_key(messages), temperature,
+                                      self, messages, semantic_task)
+        except Exception as e:
+            st.error(f"OpenAI API Error: {str(e)}")
+            return None
+    
+    def _create_completion(self, messages: List[Dict], temperature: float,
+                           on_delta: Optional[Callable[[str], None]] = None) -> str:
+        """Uncached chat completion, streamed to on_delta if given; raises on API errors"""
+        response = self._client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=2000,
+            response_format={"type": "json_object"},
+            stream=on_delta is not None
+        )
+        if on_delta is None:
+            return response.choices[0].message.content
+        
+        buffer = ''
+        for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                buffer += chunk.choices[0].delta.content
+                on_delta(buffer)
+        return buffer
+    
+    def _embed(self, text: str):
+        """Unit-normalised embedding of text, or None if unavailable"""
+        try:
+            import numpy as np
+            
+            data = self._client.embeddings.create(model=EMBEDDING_MODEL, input=text).data
+            vector = np.asarray(data[0].embedding, dtype=np.float32)
+            return vector / np.linalg.norm(vector)
+        except Exception:
+            return None
+    
+    def _semantic_completion(self, messages: List[Dict], temperature: float, task: str) -> str:
+        """_create_completion behind the semantic cache (per task key and model); raises on API errors"""
+        # Only the per-request payload: the shared system prompt adds nothing to similarity
+        vector = self._embed("\n\n".join(m['content'] for m in messages if m['role'] != 'system'))
+        namespace = f"{task}:{self.model}"
+        
+        if vector is not None:
+            cached = get_semantic_cache().lookup(namespace, vector)
+            if cached is not None:
+                return cached
+        
+        response = self._create_completion(messages, temperature)
+        if response and vector is not None:
+            get_semantic_cache().add(namespace, vector, response)
+        return response
+    
+    def analyze_cv_and_generate_questions(self, cv_text: str, target_job: str, 
+                                         difficulty: str = "Sedang") -> Dict:
+        """Generate tailored interview questions based on CV and job"""
+        
+        payload = f"""**POSISI TARGET**: {target_job}
+**TINGKAT KESULITAN**: {difficulty}
+
+**CV KANDIDAT**:
+{_trim_tokens(cv_text, CV_TOKENS_QUESTIONS, self.model)}..."""
+
+        messages = [
+            {"role": "system", "content": SYSTEM_PROMPT_QUESTIONS},
+            {"role": "user", "content": payload}
+        ]
+        # Job and difficulty are part of the namespace so a similar CV never borrows another level's questions
+        response = self._call_openai(messages, temperature=0.8,
+                                     semantic_task=f"questions:{target_job}:{difficulty}")
+        
+        result = _parse_llm_json(response)
+        if result is None:
+            return self._get_fallback_questions(target_job)
+        return result
+    
+    def evaluate_answer(self, question: Dict, answer: str, cv_context: str) -> Dict:
+        """Evaluate individual answer with detailed feedback"""
+        messages = self._answer_eval_messages(question, answer, cv_context)
+        # Exact-match cache only: a near-duplicate answer must not inherit another answer's score
+        response = self._call_openai(messages, temperature=0.5)
+        return self._parse_answer_eval(response)
+    
+    def _answer_eval_messages(self, question: Dict, answer: str, cv_context: str) -> List[Dict]:
+        """Build the evaluate_answer prompt"""
+        payload = f"""**KONTEKS CV**: {_trim_tokens(cv_context, CV_TOKENS_ANSWER_EVAL, self.model)}...
+
+**PERTANYAAN** ({question['category']}):
+{question['question']}
+
+**POIN YANG DIHARAPKAN**:
+{json_dumps_pretty(question.get('expected_answer_points', []))}
+
+**JAWABAN KANDIDAT**:
+{answer}"""
+
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT_ANSWER_EVAL},
+            {"role": "user", "content": payload}
+        ]
+    
+    def _parse_answer_eval(self, response: Optional[str]) -> Dict:
+        """Parse an evaluate_answer response, falling back on bad JSON"""
+        result = _parse_llm_json(response)
+        if result is None:
+            return self._get_fallback_answer_evaluation()
+        return result
+    
+    def evaluate_full_interview(self, questions: List[Dict], answers: List[str], 
+                               cv_text: str, target_job: str,
+                               on_score: Optional[Callable[[str, float], None]] = None,
+                               on_text: Optional[Callable[[str, Union[str, List[str]]], None]] = None) -> Dict:
+        """Comprehensive interview evaluation; on_score/on_text fire as scores and feedback text stream in"""
+        # The callbacks may write to page elements, so passing either makes this an uncached
+        # streamed call (see _call_openai); callers keep the result rather than re-evaluating
+        # The whole transcript goes out as one request: per-answer calls plus a synthesis call
+        # would wait on the slowest answer and then one more round-trip
+        
+        qa_text = "\n\n".join([
+            f"Q{i+1} [{q['category']}]: {q['question']}\nA{i+1}: {a}"
+            for i, (q, a) in enumerate(zip(questions, answers))
+        ])
+        
+        payload = f"""**TARGET POSISI**: {target_job}
 
-        messages = [{"role": "user", "content": prompt}]
+**INTERVIEW TRANSCRIPT**:
+{qa_text}
+
+**CV**: {_trim_tokens(cv_text, CV_TOKENS_FULL_EVAL, self.model)}..."""
+
+        messages = [
+            {"role": "system", "content": SYSTEM_PROMPT_FULL_EVAL},
+            {"role": "user", "content": payload}
+        ]
+        on_delta = _combine_stream_handlers(
+            _score_stream_handler(on_score) if on_score else None,
+            _text_stream_handler(on_text) if on_text else None
+        )
+        response = self._call_openai(messages, temperature=0.6, on_delta=on_delta)
+        
+        result = _parse_llm_json(response)
+        if result is None:
+            return self._get_fallback_evaluation()
+        return result
+    
+    def get_job_recommendations(self, cv_text: str, scores: Dict, 
+                               job_market_data: List[Dict]) -> List[Dict]:
+        """AI-powered job matching and recommendations"""
+        messages = self._job_recs_messages(cv_text, scores, job_market_data)
         response = self._call_openai(messages, temperature=0.7)
+        return self._parse_job_recs(response)
+    
+    def submit_job_recommendations(self, cv_text: str, scores: Dict,
+                                   job_market_data: List[Dict]) -> Optional[Future]:
+        """Start get_job_recommendations on a worker thread; collect with job_recommendations_result"""
+        if self._client is None:
+            return None
+        
+        messages = self._job_recs_messages(cv_text, scores, job_market_data)
+        return _llm_executor().submit(_cached_completion, self.model, _messages_key(messages),
+                                      0.7, self, messages)
+    
+    def job_recommendations_result(self, future: Optional[Future]) -> List[Dict]:
+        """Wait for a submit_job_recommendations future (errors are reported on this thread)"""
+        if future is None:
+            st.error(f"OpenAI API Error: {str(self._client_error)}")
+            return []
         
         try:
-            result = json.loads(response)
-            return result.get('recommendations', [])
-        except:
+            response = future.result()
+        except Exception as e:
+            st.error(f"OpenAI API Error: {str(e)}")
+            return []
+        return self._parse_job_recs(response)
+    
+    def _job_recs_messages(self, cv_text: str, scores: Dict,
+                           job_market_data: List[Dict]) -> List[Dict]:
+        """Build the get_job_recommendations prompt"""
+        job_list = "\n".join([
+            f"- {job['job_title']}: {job['description']} (Skills: {job['required_skills']})"
+            for job in job_market_data[:15]
+        ])
+        
+        payload = f"""**AVAILABLE JOBS**:
+{job_list}
+
+**SKOR INTERVIEW**:
+{json_dumps_pretty(scores)}
+
+**PROFIL KANDIDAT**:
+CV: {_trim_tokens(cv_text, CV_TOKENS_JOB_RECS, self.model)}..."""
+
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT_JOB_RECS},
+            {"role": "user", "content": payload}
+        ]
+    
+    def _parse_job_recs(self, response: Optional[str]) -> List[Dict]:
+        """Parse a get_job_recommendations response ([] on bad JSON)"""
+        result = _parse_llm_json(response)
+        if result is None:
             return []
+        return result.get('recommendations', [])
     
     def _get_fallback_questions(self, target_job: str) -> Dict:
         """Fallback questions if API fails"""
-        return {
-            "analysis": {
-                "overall_fit": "75% - Profil cukup sesuai dengan posisi",
-                "strengths": ["Pengalaman relevan", "Skill set memadai"],
-                "gaps": ["Perlu lebih detail tentang project specific"],
-                "recommendation": "Kandidat potensial untuk dipertimbangkan"
-            },
-            "questions": [
-                {
-                    "id": 1,
-                    "category": "komunikasi",
-                    "question": "Ceritakan pengalaman Anda dalam mempresentasikan ide kompleks kepada stakeholder non-teknis?",
-                    "context": "Mengukur kemampuan komunikasi efektif",
-                    "expected_answer_points": ["Situasi spesifik", "Approach yang digunakan", "Hasil"],
-                    "difficulty": "medium"
-                },
-                {
-                    "id": 2,
-                    "category": "problem_solving",
-                    "question": "Jelaskan masalah teknis tersulit yang pernah Anda hadapi dan bagaimana Anda menyelesaikannya?",
-                    "context": "Menguji analytical dan problem-solving skills",
-                    "expected_answer_points": ["Kompleksitas masalah", "Proses analisis", "Solusi", "Learning"],
-                    "difficulty": "hard"
-                },
-                {
-                    "id": 3,
-                    "category": "leadership",
-                    "question": f"Untuk posisi {target_job}, bagaimana Anda akan memimpin tim dalam menghadapi deadline ketat?",
-                    "context": "Menguji leadership style dan pressure handling",
-                    "expected_answer_points": ["Leadership approach", "Prioritization", "Team motivation"],
-                    "difficulty": "medium"
-                },
-                {
-                    "id": 4,
-                    "category": "teamwork",
-                    "question": "Ceritakan pengalaman ketika Anda harus bekerja dengan rekan tim yang sulit. Bagaimana Anda menanganinya?",
-                    "context": "Mengukur interpersonal skills dan conflict resolution",
-                    "expected_answer_points": ["Situasi", "Approach", "Resolusi", "Learning"],
-                    "difficulty": "medium"
-                },
-                {
-                    "id": 5,
-                    "category": "pengetahuan_teknis",
-                    "question": f"Jelaskan teknologi atau metodologi terkini yang relevan untuk posisi {target_job}. Bagaimana Anda mengimplementasikannya?",
-                    "context": "Menguji technical knowledge dan up-to-date awareness",
-                    "expected_answer_points": ["Technology understanding", "Implementation experience", "Best practices"],
-                    "difficulty": "hard"
-                },
-                {
-                    "id": 6,
-                    "category": "adaptabilitas",
-                    "question": "Ceritakan situasi ketika Anda harus belajar skill baru dengan cepat. Apa strategi Anda?",
-                    "context": "Mengukur learning agility",
-                    "expected_answer_points": ["Learning approach", "Resources used", "Application", "Outcome"],
-                    "difficulty": "medium"
-                },
-                {
-                    "id": 7,
-                    "category": "kreativitas",
-                    "question": "Jelaskan ide inovatif yang pernah Anda usulkan atau implementasikan. Apa impact-nya?",
-                    "context": "Menguji creative thinking dan innovation",
-                    "expected_answer_points": ["Ide", "Implementation", "Challenges", "Impact"],
-                    "difficulty": "medium"
-                },
-                {
-                    "id": 8,
-                    "category": "critical_thinking",
-                    "question": "Bagaimana Anda membuat keputusan penting ketika data yang tersedia terbatas atau ambigu?",
-                    "context": "Menguji decision making under uncertainty",
-                    "expected_answer_points": ["Decision framework", "Risk assessment", "Validation", "Learning"],
-                    "difficulty": "hard"
-                }
-            ]
-        }
+        questions = list(_FALLBACK_QUESTIONS['questions'])
+        for i in _FALLBACK_JOB_QUESTIONS:
+            q = questions[i]
+            questions[i] = {**q, 'question': q['question'].format(target_job=target_job)}
+        return {**_FALLBACK_QUESTIONS, 'questions': questions}
+    
+    def _get_fallback_answer_evaluation(self) -> Dict:
+        """Fallback single-answer evaluation if API fails (shared, do not mutate)"""
+        return _FALLBACK_ANSWER_EVALUATION
     
     def _get_fallback_evaluation(self) -> Dict:
-        """Fallback evaluation if API fails"""
-        return {
-            "scores": {
-                "komunikasi": 75,
-                "problem_solving": 72,
-                "leadership": 70,
-                "teamwork": 78,
-                "pengetahuan_teknis": 68,
-                "adaptabilitas": 74,
-                "kreativitas": 71,
-                "critical_thinking": 73
-            },
-            "category_feedback": {
-                "komunikasi": "Komunikasi cukup jelas, perlu lebih terstruktur",
-                "problem_solving": "Menunjukkan kemampuan analitis yang baik",
-                "leadership": "Potensi leadership terlihat, perlu lebih banyak contoh",
-                "teamwork": "Kemampuan kolaborasi sangat baik",
-                "pengetahuan_teknis": "Perlu memperdalam pengetahuan teknis",
-                "adaptabilitas": "Menunjukkan fleksibilitas yang memadai",
-                "kreativitas": "Ide-ide cukup inovatif",
-                "critical_thinking": "Analytical thinking cukup baik"
-            },
-            "overall_assessment": "Kandidat menunjukkan performa yang cukup baik dengan potensi untuk berkembang. Beberapa area memerlukan peningkatan.",
-            "strengths": ["Komunikasi yang baik", "Kemampuan teamwork", "Adaptabilitas"],
-            "weaknesses": ["Pengetahuan teknis perlu diperdalam", "Leadership presence bisa lebih kuat"],
-            "red_flags": [],
-            "recommendation": {
-                "decision": "Maybe",
-                "confidence": "65%",
-                "reasoning": "Kandidat potensial namun perlu evaluasi lebih lanjut pada aspek teknis",
-                "next_steps": ["Technical deep-dive", "Meet the team", "Case study"]
-            },
-            "development_plan": {
-                "priority_areas": ["Pengetahuan Teknis", "Leadership Skills"],
-                "suggested_actions": [
-                    "Ikuti training/sertifikasi teknis",
-                    "Ambil leadership role dalam project",
-                    "Pelajari best practices industri"
-                ],
-                "timeline": "3-6 bulan"
-            }
-        }
+        """Fallback evaluation if API fails (shared, do not mutate)"""
+        return _FALLBACK_EVALUATION
+
+@st.cache_resource
+def get_llm() -> LLMService:
+    """Process-wide LLMService: one client/HTTP pool across reruns"""
+    return LLMService()
 
 # ============================
 # ENHANCED VISUALIZATION
 # ============================
 
+# Static trace/layout pieces; figures are built from plain dicts in one go.Figure call
+_TRANSPARENT_BG = {'paper_bgcolor': 'rgba(0,0,0,0)', 'plot_bgcolor': 'rgba(0,0,0,0)'}
+_TITLE_FONT = {'size': 16, 'color': '#1f2937'}
+
+_RADAR_LAYOUT = {
+    'polar': {
+        'radialaxis': {
+            'visible': True,
+            'range': [0, 100],
+            'tickfont': {'size': 10},
+            'gridcolor': 'rgba(128, 128, 128, 0.2)'
+        },
+        'angularaxis': {'tickfont': {'size': 11, 'color': '#1f2937'}}
+    },
+    'showlegend': True,
+    'height': 450,
+    **_TRANSPARENT_BG
+}
+
+_COMPARISON_LAYOUT = {
+    'title': {'text': 'Progress Comparison'},
+    'xaxis': {'title': {'text': 'Kategori'}},
+    'yaxis': {'title': {'text': 'Skor'}, 'range': [0, 100]},
+    'barmode': 'group',
+    'height': 400,
+    'showlegend': True,
+    **_TRANSPARENT_BG
+}
+
+_BAR_LAYOUT = {
+    'xaxis': {'title': {'text': 'Kategori'}, 'tickangle': -45},
+    'yaxis': {'title': {'text': 'Skor'}, 'range': [0, 110]},
+    'height': 400,
+    **_TRANSPARENT_BG
+}
+
+_PROGRESS_TRACE = {
+    'mode': 'lines+markers',
+    'line': {'color': '#3b82f6', 'width': 3},
+    'marker': {'size': 8, 'color': '#3b82f6'},
+    'fill': 'tozeroy',
+    'fillcolor': 'rgba(59, 130, 246, 0.2)'
+}
+
+_PROGRESS_LAYOUT = {
+    'title': {'text': 'Score Progress Over Time'},
+    'xaxis': {'title': {'text': 'Date'}},
+    'yaxis': {'title': {'text': 'Score'}, 'range': [0, 100]},
+    'height': 350,
+    'showlegend': False,
+    **_TRANSPARENT_BG
+}
+
+_GAUGE_SPEC = {
+    'axis': {'range': [None, 100], 'tickwidth': 1, 'tickcolor': "darkgray"},
+    'bar': {'color': "#3b82f6"},
+    'bgcolor': "white",
+    'borderwidth': 2,
+    'bordercolor': "gray",
+    'steps': [
+        {'range': [0, 60], 'color': '#fee2e2'},
+        {'range': [60, 75], 'color': '#fef3c7'},
+        {'range': [75, 100], 'color': '#d1fae5'}
+    ],
+    'threshold': {
+        'line': {'color': "red", 'width': 4},
+        'thickness': 0.75,
+        'value': CONFIG.passing_score
+    }
+}
+
+_GAUGE_LAYOUT = {
+    'height': 300,
+    'paper_bgcolor': 'rgba(0,0,0,0)',
+    'font': {'color': "#1f2937", 'family': "Arial"}
+}
+
 class VisualizationService:
     """Enhanced visualization with multiple chart types"""
     
     @staticmethod
     def create_radar_chart(scores: Dict, title: str = "Hasil Penilaian Interview") -> go.Figure:
         """Create enhanced radar chart"""
-        categories = [k.replace('_', ' ').title() for k in scores.keys()]
-        values = list(scores.values())
-        
-        fig = go.Figure()
+        import plotly.graph_objects as go
         
-        fig.add_trace(go.Scatterpolar(
-            r=values,
-            theta=categories,
-            fill='toself',
-            name='Skor Anda',
-            line=dict(color='#3b82f6', width=2),
-            fillcolor='rgba(59, 130, 246, 0.3)'
-        ))
-        
-        # Add average benchmark line
-        avg_benchmark = [75] * len(categories)
-        fig.add_trace(go.Scatterpolar(
-            r=avg_benchmark,
-            theta=categories,
-            name='Benchmark (75)',
-            line=dict(color='#10b981', width=2, dash='dash'),
-            fill=None
-        ))
-        
-        fig.update_layout(
-            polar=dict(
-                radialaxis=dict(
-                    visible=True,
-                    range=[0, 100],
-                    tickfont=dict(size=10),
-                    gridcolor='rgba(128, 128, 128, 0.2)'
-                ),
-                angularaxis=dict(
-                    tickfont=dict(size=11, color='#1f2937')
-                )
-            ),
-            showlegend=True,
-            title=dict(text=title, font=dict(size=16, color='#1f2937')),
-            height=450,
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)'
-        )
+        categories = [_category_label(k) for k in scores]
+        values = list(scores.values())
         
-        return fig
+        return go.Figure({
+            'data': [
+                {
+                    'type': 'scatterpolar',
+                    'r': values,
+                    'theta': categories,
+                    'fill': 'toself',
+                    'name': 'Skor Anda',
+                    'line': {'color': '#3b82f6', 'width': 2},
+                    'fillcolor': 'rgba(59, 130, 246, 0.3)'
+                },
+                # Average benchmark line
+                {
+                    'type': 'scatterpolar',
+                    'r': [75] * len(categories),
+                    'theta': categories,
+                    'name': 'Benchmark (75)',
+                    'line': {'color': '#10b981', 'width': 2, 'dash': 'dash'}
+                }
+            ],
+            'layout': {**_RADAR_LAYOUT, 'title': {'text': title, 'font': _TITLE_FONT}}
+        })
     
     @staticmethod
     def create_comparison_chart(current_scores: Dict, history_scores: List[Dict]) -> go.Figure:
         """Create comparison chart showing progress"""
+        import plotly.graph_objects as go
+        
         if not history_scores:
             return VisualizationService.create_bar_chart(current_scores)
         
-        categories = list(current_scores.keys())
-        
-        fig = go.Figure()
-        
-        # Add historical scores
-        for i, hist in enumerate(history_scores[-3:]):  # Last 3 interviews
-            fig.add_trace(go.Bar(
-                name=f'Interview {len(history_scores)-len(history_scores[-3:])+i+1}',
-                x=[k.replace('_', ' ').title() for k in categories],
-                y=[hist.get(k, 0) for k in categories],
-                opacity=0.6
-            ))
-        
-        # Add current score
-        fig.add_trace(go.Bar(
-            name='Current',
-            x=[k.replace('_', ' ').title() for k in categories],
-            y=list(current_scores.values()),
-            marker=dict(color='#3b82f6')
-        ))
-        
-        fig.update_layout(
-            title='Progress Comparison',
-            xaxis_title='Kategori',
-            yaxis_title='Skor',
-            yaxis=dict(range=[0, 100]),
-            barmode='group',
-            height=400,
-            showlegend=True,
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)'
-        )
+        import numpy as np
         
-        return fig
+        categories = list(current_scores.keys())
+        labels = [_category_label(k) for k in categories]
+        
+        # Last 3 interviews as one (interviews x categories) matrix
+        recent = history_scores[-3:]
+        hist_matrix = np.array([[hist.get(k, 0) for k in categories] for hist in recent], dtype=np.float64)
+        first_no = len(history_scores) - len(recent) + 1
+        
+        # Historical scores, then the current one
+        data = [
+            {'type': 'bar', 'name': f'Interview {first_no + i}', 'x': labels, 'y': row, 'opacity': 0.6}
+            for i, row in enumerate(hist_matrix.tolist())
+        ]
+        data.append({
+            'type': 'bar',
+            'name': 'Current',
+            'x': labels,
+            'y': list(current_scores.values()),
+            'marker': {'color': '#3b82f6'}
+        })
+        
+        return go.Figure({'data': data, 'layout': _COMPARISON_LAYOUT})
     
     @staticmethod
     def create_bar_chart(scores: Dict, title: str = 'Penilaian per Kategori') -> go.Figure:
         """Create enhanced bar chart"""
-        categories = [k.replace('_', ' ').title() for k in scores.keys()]
-        values = list(scores.values())
-        
-        colors = ['#ef4444' if v < 60 else '#f59e0b' if v < 75 else '#10b981' for v in values]
-        
-        fig = go.Figure()
-        
-        fig.add_trace(go.Bar(
-            x=categories,
-            y=values,
-            marker=dict(
-                color=colors,
-                line=dict(color='rgba(0,0,0,0.3)', width=1)
-            ),
-            text=values,
-            texttemplate='%{text:.1f}',
-            textposition='outside',
-            textfont=dict(size=12, color='#1f2937')
-        ))
-        
-        fig.update_layout(
-            title=dict(text=title, font=dict(size=16, color='#1f2937')),
-            xaxis_title='Kategori',
-            yaxis_title='Skor',
-            yaxis=dict(range=[0, 110]),
-            height=400,
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            xaxis=dict(tickangle=-45)
-        )
+        import plotly.graph_objects as go
+        
+        import numpy as np
+        
+        categories = [_category_label(k) for k in scores]
+        v_arr = np.fromiter(scores.values(), dtype=np.float64, count=len(scores))
+        values = v_arr.tolist()
+        
+        colors = [_BAR_COLORS[i] for i in np.clip(v_arr, 0, 100).astype(np.intp).tolist()]
+        
+        return go.Figure({
+            'data': [{
+                'type': 'bar',
+                'x': categories,
+                'y': values,
+                'marker': {'color': colors, 'line': {'color': 'rgba(0,0,0,0.3)', 'width': 1}},
+                'text': values,
+                'texttemplate': '%{text:.1f}',
+                'textposition': 'outside',
+                'textfont': {'size': 12, 'color': '#1f2937'}
+            }],
+            'layout': {**_BAR_LAYOUT, 'title': {'text': title, 'font': _TITLE_FONT}}
+        })
+    
+    @staticmethod
+    def make_progress_figure(x, y, name: str = 'Total Score') -> go.Figure:
+        """WebGL progress line"""
+        import plotly.graph_objects as go
         
-        return fig
+        return go.Figure({'data': [{**_PROGRESS_TRACE, 'type': 'scattergl', 'name': name, 'x': x, 'y': y}]})
     
     @staticmethod
     def create_progress_timeline(user_id: str, db: DatabaseManager) -> go.Figure:
         """Create timeline of user progress"""
-        history = db.get_user_history(user_id, limit=20)
+        import plotly.graph_objects as go
         
-        if not history:
-            return go.Figure()
-        
-        dates = [h['created_at'] for h in history]
-        scores = [h['total_score'] for h in history]
+        dates, scores = db.get_score_series(user_id, limit=20)
         
-        fig = go.Figure()
+        if not len(scores):
+            return go.Figure()
         
-        fig.add_trace(go.Scatter(
-            x=dates,
-            y=scores,
-            mode='lines+markers',
-            name='Total Score',
-            line=dict(color='#3b82f6', width=3),
-            marker=dict(size=8, color='#3b82f6'),
-            fill='tozeroy',
-            fillcolor='rgba(59, 130, 246, 0.2)'
-        ))
+        fig = VisualizationService.make_progress_figure(dates, scores)
         
         # Add passing score line
         fig.add_hline(
@@ -1001,86 +1822,127 @@ class VisualizationService:
             annotation_text=f"Passing Score ({CONFIG.passing_score})"
         )
         
-        fig.update_layout(
-            title='Score Progress Over Time',
-            xaxis_title='Date',
-            yaxis_title='Score',
-            yaxis=dict(range=[0, 100]),
-            height=350,
-            showlegend=False,
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)'
-        )
+        fig.update_layout(_PROGRESS_LAYOUT)
         
         return fig
     
     @staticmethod
     def create_gauge_chart(score: float, title: str = "Overall Score") -> go.Figure:
         """Create gauge chart for overall score"""
-        fig = go.Figure(go.Indicator(
-            mode="gauge+number+delta",
-            value=score,
-            domain={'x': [0, 1], 'y': [0, 1]},
-            title={'text': title, 'font': {'size': 18}},
-            delta={'reference': CONFIG.passing_score, 'increasing': {'color': "#10b981"}},
-            gauge={
-                'axis': {'range': [None, 100], 'tickwidth': 1, 'tickcolor': "darkgray"},
-                'bar': {'color': "#3b82f6"},
-                'bgcolor': "white",
-                'borderwidth': 2,
-                'bordercolor': "gray",
-                'steps': [
-                    {'range': [0, 60], 'color': '#fee2e2'},
-                    {'range': [60, 75], 'color': '#fef3c7'},
-                    {'range': [75, 100], 'color': '#d1fae5'}
-                ],
-                'threshold': {
-                    'line': {'color': "red", 'width': 4},
-                    'thickness': 0.75,
-                    'value': CONFIG.passing_score
-                }
-            }
-        ))
-        
-        fig.update_layout(
-            height=300,
-            paper_bgcolor='rgba(0,0,0,0)',
-            font={'color': "#1f2937", 'family': "Arial"}
-        )
-        
-        return fig
+        import plotly.graph_objects as go
+        
+        return go.Figure({
+            'data': [{
+                'type': 'indicator',
+                'mode': "gauge+number+delta",
+                'value': score,
+                'domain': {'x': [0, 1], 'y': [0, 1]},
+                'title': {'text': title, 'font': {'size': 18}},
+                'delta': {'reference': CONFIG.passing_score, 'increasing': {'color': "#10b981"}},
+                'gauge': _GAUGE_SPEC
+            }],
+            'layout': _GAUGE_LAYOUT
+        })
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _results_charts(score_items: Tuple[Tuple[str, float], ...], avg_score: float):
+    """Radar, gauge and bar figures for the results page, built once per set of scores"""
+    # Items keep the evaluation's category order, which the charts display in
+    scores = dict(score_items)
+    return (
+        VisualizationService.create_radar_chart(scores),
+        VisualizationService.create_gauge_chart(avg_score),
+        VisualizationService.create_bar_chart(scores)
+    )
 
 # ============================
 # UTILITY FUNCTIONS
 # ============================
 
+def _gtts_bytes(text: str, lang: str) -> bytes:
+    """Synthesize text to MP3 bytes; raises on failure"""
+    fp = BytesIO()
+    _get_gtts()(text=text, lang=lang, slow=False).write_to_fp(fp)
+    return fp.getvalue()
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_tts(text: str, lang: str, _future: Optional[Future] = None) -> bytes:
+    """TTS audio per (text, lang); reuses a prefetch future if one is running"""
+    return _future.result() if _future is not None else _gtts_bytes(text, lang)
+
+def _pdf_text(data: bytes) -> str:
+    """Extract text from PDF bytes (PyMuPDF, then PDFium, then PyPDF2); raises on failure"""
+    fitz = _get_fitz()
+    if fitz is not None:
+        try:
+            with fitz.open(stream=data, filetype="pdf") as doc:
+                return "\n".join(page.get_text("text") for page in doc).strip()
+        except Exception:
+            # Fall back to the other extractors for PDFs MuPDF rejects
+            if _get_pdfium() is None and _get_pypdf2() is None:
+                raise
+    
+    pdfium = _get_pdfium()
+    if pdfium is not None:
+        # Native PDFium text extraction
+        pdf = pdfium.PdfDocument(data)
+        parts = [pdf[i].get_textpage().get_text_range() for i in range(len(pdf))]
+    else:
+        pdf_reader = _get_pypdf2().PdfReader(BytesIO(data))
+        parts = [page.extract_text() for page in pdf_reader.pages]
+    return "\n".join(parts).strip()
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _cached_pdf_text(data: bytes, _future: Optional[Future] = None) -> str:
+    """PDF text per file content; reuses a background extraction future if one is running"""
+    return _future.result() if _future is not None else _pdf_text(data)
+
+@st.cache_resource
+def _pdf_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix='pdf')
+
+@st.cache_resource
+def _tts_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix='tts')
+
 class Utils:
     """Utility functions for the application"""
     
     @staticmethod
     def generate_session_id() -> str:
         """Generate unique session ID"""
-        timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
-        random_hash = hashlib.md5(str(time.time()).encode()).hexdigest()[:8]
-        return f"session_{timestamp}_{random_hash}"
+        return f"session_{time.strftime('%Y%m%d%H%M%S')}_{secrets.token_hex(4)}"
     
     @staticmethod
     def extract_text_from_pdf(pdf_file) -> Optional[str]:
         """Extract text from uploaded PDF file"""
-        if PyPDF2 is None:
+        if _get_fitz() is None and _get_pdfium() is None and _get_pypdf2() is None:
             st.error("❌ PyPDF2 not installed. Please install it with: pip install PyPDF2")
             return None
         
+        data = pdf_file.getvalue() if hasattr(pdf_file, 'getvalue') else pdf_file.read()
+        key = hashlib.blake2b(data, digest_size=16).hexdigest()
+        # Left in place once done, so reruns with the same upload don't parse it again
+        future = st.session_state.get('pdf_extractions', {}).get(key)
         try:
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return text.strip()
+            return _cached_pdf_text(data, future)
         except Exception as e:
             st.error(f"Error reading PDF: {str(e)}")
             return None
     
+    @staticmethod
+    def start_pdf_extraction(pdf_file) -> Optional[Future]:
+        """Start parsing the PDF on a worker thread; extract_text_from_pdf collects the result"""
+        if _get_fitz() is None and _get_pdfium() is None and _get_pypdf2() is None:
+            return None
+        
+        data = pdf_file.getvalue()
+        key = hashlib.blake2b(data, digest_size=16).hexdigest()
+        pending = st.session_state.setdefault('pdf_extractions', {})
+        if key not in pending:
+            pending[key] = _pdf_executor().submit(_pdf_text, data)
+        return pending[key]
+    
     @staticmethod
     def validate_cv(cv_text: str) -> Tuple[bool, str]:
         """Validate CV text"""
@@ -1090,12 +1952,8 @@ class Utils:
         if len(cv_text) > 10000:
             return False, "CV terlalu panjang. Maksimal 10.000 karakter."
         
-        # Check for basic CV elements
-        cv_lower = cv_text.lower()
-        has_experience = any(word in cv_lower for word in ['pengalaman', 'experience', 'kerja', 'work'])
-        has_skills = any(word in cv_lower for word in ['skill', 'kemampuan', 'keahlian', 'kompeten'])
-        
-        if not (has_experience or has_skills):
+        # Check for basic CV elements (experience or skills keywords)
+        if not _CV_KEYWORDS_RE.search(cv_text):
             return False, "CV harus mencantumkan pengalaman atau keahlian."
         
         return True, "CV valid"
@@ -1103,33 +1961,36 @@ class Utils:
     @staticmethod
     def text_to_speech(text: str, lang: str = 'id') -> Optional[bytes]:
         """Convert text to speech"""
-        if gTTS is None:
+        if _get_gtts() is None:
             return None
         
+        future = st.session_state.get('tts_prefetch', {}).pop((text, lang), None)
         try:
-            tts = gTTS(text=text, lang=lang, slow=False)
-            fp = BytesIO()
-            tts.write_to_fp(fp)
-            fp.seek(0)
-            return fp.read()
+            return _cached_tts(text, lang, future)
         except Exception as e:
             st.error(f"Error generating speech: {str(e)}")
             return None
     
+    @staticmethod
+    def prefetch_speech(text: str, lang: str = 'id'):
+        """Start synthesizing text in the background so a later text_to_speech is instant"""
+        if _get_gtts() is None:
+            return
+        
+        pending = st.session_state.setdefault('tts_prefetch', {})
+        if (text, lang) not in pending:
+            pending[(text, lang)] = _tts_executor().submit(_gtts_bytes, text, lang)
+    
     @staticmethod
     def autoplay_audio(audio_bytes: bytes):
         """Autoplay audio in browser"""
-        b64 = base64.b64encode(audio_bytes).decode()
-        audio_html = f"""
-            <audio autoplay>
-                <source src="data:audio/mp3;base64,{b64}" type="audio/mp3">
-            </audio>
-        """
-        st.markdown(audio_html, unsafe_allow_html=True)
+        st.audio(audio_bytes, format='audio/mp3', autoplay=True)
     
     @staticmethod
     def format_duration(seconds: int) -> str:
         """Format duration in readable format"""
+        if type(seconds) is int and 0 <= seconds <= 600:
+            return _DURATIONS[seconds]
         minutes = seconds // 60
         secs = seconds % 60
         return f"{minutes}m {secs}s"
@@ -1137,23 +1998,13 @@ class Utils:
     @staticmethod
     def calculate_grade(score: float) -> str:
         """Calculate letter grade from score"""
-        if score >= 90:
-            return "A (Excellent)"
-        elif score >= 80:
-            return "B (Very Good)"
-        elif score >= 70:
-            return "C (Good)"
-        elif score >= 60:
-            return "D (Fair)"
-        else:
-            return "E (Needs Improvement)"
+        return _GRADES[max(0, min(100, int(score)))]
     
     @staticmethod
     def export_to_json(data: Dict, filename: str = "interview_result.json"):
         """Export data to JSON file"""
         try:
-            json_str = json.dumps(data, indent=2, ensure_ascii=False)
-            return json_str
+            return json_dumps_pretty(data)
         except Exception as e:
             st.error(f"Error exporting data: {str(e)}")
             return None
@@ -1162,154 +2013,259 @@ class Utils:
 # STREAMLIT UI COMPONENTS
 # ============================
 
+def _write_bullets(items):
+    """Render a list as one Markdown bullet list (one element instead of one st.write per item)"""
+    if items:
+        st.markdown("\n".join(f"- {item}" for item in items))
+
+# Self-contained header document, built once at import and rendered in an iframe
+# that Streamlit keeps mounted across reruns while the content is unchanged
+HEADER_HEIGHT = 160
+_HEADER_HTML = """
+<style>
+body {
+    margin: 0;
+    font-family: "Source Sans Pro", sans-serif;
+}
+.main-header {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    padding: 2rem;
+    border-radius: 10px;
+    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+}
+.main-header h1 {
+    color: white;
+    margin: 0;
+    font-size: 2.5rem;
+}
+.main-header p {
+    color: rgba(255, 255, 255, 0.9);
+    margin: 0.5rem 0 0 0;
+    font-size: 1.1rem;
+}
+</style>
+<div class="main-header">
+    <h1>🎯 AI Interview Training System Pro</h1>
+    <p>Latihan interview AI-powered dengan feedback real-time dan analytics mendalam</p>
+</div>
+"""
+
 def render_header():
     """Render application header"""
-    st.markdown("""
-        <style>
-        .main-header {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            padding: 2rem;
-            border-radius: 10px;
-            margin-bottom: 2rem;
-            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        }
-        .main-header h1 {
-            color: white;
-            margin: 0;
-            font-size: 2.5rem;
-        }
-        .main-header p {
-            color: rgba(255, 255, 255, 0.9);
-            margin: 0.5rem 0 0 0;
-            font-size: 1.1rem;
-        }
-        </style>
-        <div class="main-header">
-            <h1>🎯 AI Interview Training System Pro</h1>
-            <p>Latihan interview AI-powered dengan feedback real-time dan analytics mendalam</p>
-        </div>
-    """, unsafe_allow_html=True)
-
-def render_sidebar(db: DatabaseManager):
-    """Render enhanced sidebar"""
-    with st.sidebar:
-        st.image("https://via.placeholder.com/200x80/667eea/ffffff?text=InterviewAI", use_container_width=True)
-        
-        st.markdown("---")
-        
-        # Model selection
+    components.html(_HEADER_HTML, height=HEADER_HEIGHT, scrolling=False)
+
+# Inline sidebar logo (no external image fetch on page load)
+_LOGO_SVG = (
+    '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 200 80" width="100%" role="img" aria-label="InterviewAI">'
+    '<rect width="200" height="80" rx="8" fill="#667eea"/>'
+    '<text x="100" y="47" text-anchor="middle" fill="#ffffff" font-family="Arial, sans-serif" '
+    'font-size="22" font-weight="600">InterviewAI</text>'
+    '</svg>'
+)
+
+# Static sidebar copy
+_FEATURES_MD = """
+**✅ Active:**
+- 📝 Text CV Input
+- 📄 PDF CV Upload
+- 📹 Video Interview Mode
+- 🔊 Text-to-Speech
+- 💾 Result Export
+
+**🚧 Coming Soon:**
+- 🎤 Voice Recognition
+- 🤖 AI Voice Response
+- 📊 Advanced Analytics
+"""
+
+_ABOUT_MD = """
+**Technology Stack:**
+- 🤖 OpenAI GPT-4
+- 🎙️ gTTS (Text-to-Speech)
+- 📄 PyPDF2 (PDF Reader)
+- 📹 Streamlit Camera
+- 📊 Plotly Charts
+- 💾 SQLite DB
+- 🚀 Streamlit
+
+**Version:** 2.1 Pro
+"""
+
+_INSTALL_CMD = """
+# Install required packages
+pip install streamlit
+pip install openai
+pip install plotly
+pip install pandas
+pip install PyPDF2
+pip install gTTS
+
+# Optional for advanced features
+pip install SpeechRecognition
+pip install pydub
+"""
+
+# Sidebar widget key -> the session_state setting it feeds once applied
+_PENDING_SETTINGS = {
+    'pending_model': 'model_choice',
+    'pending_difficulty': 'difficulty',
+    'pending_voice': 'enable_voice',
+    'pending_camera': 'enable_camera',
+    'pending_timer': 'enable_timer'
+}
+
+def _apply_settings():
+    """Form submit callback: promote the pending widget values to the active settings"""
+    for pending, active in _PENDING_SETTINGS.items():
+        st.session_state[active] = st.session_state[pending]
+
+def _sidebar_settings():
+    """Settings form; widget edits don't rerun anything until Apply is submitted"""
+    for pending, active in _PENDING_SETTINGS.items():
+        if pending not in st.session_state:
+            st.session_state[pending] = st.session_state[active]
+    
+    with st.form("sidebar_settings", clear_on_submit=False, border=False):
         st.subheader("⚙️ Pengaturan")
-        model_choice = st.selectbox(
+        st.selectbox(
             "Model AI",
             ["gpt-4o", "gpt-4o-mini", "gpt-3.5-turbo"],
+            key='pending_model',
             help="Pilih model AI untuk interview"
         )
         
-        difficulty = st.select_slider(
+        st.select_slider(
             "Tingkat Kesulitan",
             options=["Mudah", "Sedang", "Sulit", "Ahli"],
-            value="Sedang"
+            key='pending_difficulty'
         )
         
-        enable_voice = st.checkbox("🎤 Aktifkan Voice (TTS)", value=False, 
-                                   help="Text-to-speech untuk membacakan pertanyaan")
-        enable_camera = st.checkbox("📹 Aktifkan Camera", value=False,
-                                    help="Mode video interview dengan kamera")
-        enable_timer = st.checkbox("⏱️ Aktifkan Timer", value=True)
+        st.checkbox("🎤 Aktifkan Voice (TTS)", key='pending_voice',
+                    help="Text-to-speech untuk membacakan pertanyaan")
+        st.checkbox("📹 Aktifkan Camera", key='pending_camera',
+                    help="Mode video interview dengan kamera")
+        st.checkbox("⏱️ Aktifkan Timer", key='pending_timer')
+        
+        st.form_submit_button("✅ Apply Settings", on_click=_apply_settings, use_container_width=True)
+
+@st.fragment
+def _sidebar_quick_stats(user_id: str):
+    """Quick stats block, rendered independently of the main page"""
+    st.subheader("📊 Quick Stats")
+    # Served from the _fetch_analytics cache; invalidated when this user saves a new result
+    analytics = get_db().get_analytics_data(user_id)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Total Interview", analytics.total_interviews)
+    with col2:
+        st.metric("Avg Score", f"{analytics.avg_score:.1f}")
+    
+    rate = analytics.improvement_rate
+    if rate:
+        rate_text = f"{rate:+.1f}%"
+        st.metric("Improvement", rate_text, delta=rate_text)
+
+def _go_to_stage(stage: str):
+    """Button callback: switch stage before the (single) rerun the click triggers"""
+    st.session_state.stage = stage
+
+def render_sidebar():
+    """Render enhanced sidebar"""
+    with st.sidebar:
+        st.markdown(_LOGO_SVG, unsafe_allow_html=True)
+        
+        st.markdown("---")
+        
+        # Settings (form: tweaking a widget doesn't rerun the app)
+        _sidebar_settings()
         
         st.markdown("---")
         
         # Quick stats
         if 'user_id' in st.session_state:
-            st.subheader("📊 Quick Stats")
-            analytics = db.get_analytics_data(st.session_state.user_id)
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                st.metric("Total Interview", analytics['total_interviews'])
-            with col2:
-                st.metric("Avg Score", f"{analytics['avg_score']:.1f}")
-            
-            if analytics['improvement_rate'] != 0:
-                st.metric(
-                    "Improvement", 
-                    f"{analytics['improvement_rate']:+.1f}%",
-                    delta=f"{analytics['improvement_rate']:.1f}%"
-                )
+            _sidebar_quick_stats(st.session_state.user_id)
         
         st.markdown("---")
         
         # Navigation
         st.subheader("🧭 Navigation")
-        if st.button("🏠 Home", use_container_width=True):
-            st.session_state.stage = 'input'
-            st.rerun()
-        
-        if st.button("📚 History", use_container_width=True):
-            st.session_state.stage = 'history'
-            st.rerun()
-        
-        if st.button("📈 Analytics", use_container_width=True):
-            st.session_state.stage = 'analytics'
-            st.rerun()
+        st.button("🏠 Home", on_click=_go_to_stage, args=('input',), use_container_width=True)
+        st.button("📚 History", on_click=_go_to_stage, args=('history',), use_container_width=True)
+        st.button("📈 Analytics", on_click=_go_to_stage, args=('analytics',), use_container_width=True)
         
         st.markdown("---")
         
         # Feature info
         st.subheader("🎯 Features")
         with st.expander("📋 Available Features"):
-            st.markdown("""
-            **✅ Active:**
-            - 📝 Text CV Input
-            - 📄 PDF CV Upload
-            - 📹 Video Interview Mode
-            - 🔊 Text-to-Speech
-            - 💾 Result Export
-            
-            **🚧 Coming Soon:**
-            - 🎤 Voice Recognition
-            - 🤖 AI Voice Response
-            - 📊 Advanced Analytics
-            """)
+            st.markdown(_FEATURES_MD)
         
         st.markdown("---")
         
         # Info
         st.subheader("ℹ️ About")
-        st.info("""
-        **Technology Stack:**
-        - 🤖 OpenAI GPT-4
-        - 🎙️ gTTS (Text-to-Speech)
-        - 📄 PyPDF2 (PDF Reader)
-        - 📹 Streamlit Camera
-        - 📊 Plotly Charts
-        - 💾 SQLite DB
-        - 🚀 Streamlit
-        
-        **Version:** 2.1 Pro
-        """)
+        st.info(_ABOUT_MD)
         
         # Installation guide
         with st.expander("📦 Installation Requirements"):
-            st.code("""
-# Install required packages
-pip install streamlit
-pip install openai
-pip install plotly
-pip install pandas
-pip install PyPDF2
-pip install gTTS
-
-# Optional for advanced features
-pip install SpeechRecognition
-pip install pydub
-            """, language="bash")
-        
-        return model_choice, difficulty, enable_voice, enable_camera, enable_timer
+            st.code(_INSTALL_CMD, language="bash")
 
 # ============================
 # MAIN STREAMLIT APP
 # ============================
+_APP_CSS = """
+<style>
+.stButton>button {
+    width: 100%;
+    border-radius: 5px;
+    height: 3em;
+    font-weight: 600;
+}
+.metric-card {
+    background: white;
+    padding: 1rem;
+    border-radius: 8px;
+    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+}
+.success-banner {
+    background: linear-gradient(135deg, #10b981 0%, #059669 100%);
+    color: white;
+    padding: 1rem;
+    border-radius: 8px;
+    margin: 1rem 0;
+}
+.warning-banner {
+    background: linear-gradient(135deg, #f59e0b 0%, #d97706 100%);
+    color: white;
+    padding: 1rem;
+    border-radius: 8px;
+    margin: 1rem 0;
+}
+</style>
+"""
+
+# Session state defaults, applied once per session (user_id is generated then too)
+_SESSION_DEFAULTS = {
+    'stage': 'input',
+    'questions': [],
+    'answers': [],
+    'answer_metadata': [],
+    'current_question_idx': 0,
+    'interview_start_time': None,
+    'question_start_time': None,
+    'model_choice': "gpt-4o",
+    'difficulty': "Sedang",
+    'enable_voice': False,
+    'enable_camera': False,
+    'enable_timer': True,
+    'page': 0
+}
+
+# Interview progress keys put back to their defaults by "New Interview"
+_INTERVIEW_STATE_KEYS = ('questions', 'answers', 'answer_metadata', 'current_question_idx',
+                         'interview_start_time', 'question_start_time')
+
 def main():
     st.set_page_config(
         page_title="AI Interview Training Pro",
@@ -1319,74 +2275,27 @@ def main():
     )
     
     # Custom CSS
-    st.markdown("""
-        <style>
-        .stButton>button {
-            width: 100%;
-            border-radius: 5px;
-            height: 3em;
-            font-weight: 600;
-        }
-        .metric-card {
-            background: white;
-            padding: 1rem;
-            border-radius: 8px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }
-        .success-banner {
-            background: linear-gradient(135deg, #10b981 0%, #059669 100%);
-            color: white;
-            padding: 1rem;
-            border-radius: 8px;
-            margin: 1rem 0;
-        }
-        .warning-banner {
-            background: linear-gradient(135deg, #f59e0b 0%, #d97706 100%);
-            color: white;
-            padding: 1rem;
-            border-radius: 8px;
-            margin: 1rem 0;
-        }
-        </style>
-    """, unsafe_allow_html=True)
+    st.markdown(_APP_CSS, unsafe_allow_html=True)
     
     # Initialize services
-    db = DatabaseManager()
-    llm = LLMService()
-    
-    # Session state initialization
-    default_session_state = {
-        'user_id': f"user_{datetime.now().strftime('%Y%m%d%H%M%S')}",
-        'stage': 'input',
-        'questions': [],
-        'answers': [],
-        'answer_metadata': [],
-        'current_question_idx': 0,
-        'interview_start_time': None,
-        'question_start_time': None,
-        'model_choice': "gpt-4o",
-        'difficulty': "Sedang",
-        'enable_voice': False,
-        'enable_camera': False,
-        'enable_timer': True
-    }
-    
-    for key, value in default_session_state.items():
-        if key not in st.session_state:
-            st.session_state[key] = value
+    db = get_db()
+    llm = get_llm()
+    
+    # Session state initialization (first run of the session only)
+    if 'initialized' not in st.session_state:
+        if 'user_id' not in st.session_state:
+            st.session_state.user_id = f"user_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        for key, value in _SESSION_DEFAULTS.items():
+            if key not in st.session_state:
+                # Copied so sessions never share the default lists
+                st.session_state[key] = copy.copy(value)
+        st.session_state.initialized = True
     
     # Render header
     render_header()
     
-    # Render sidebar and get settings
-    model_choice, difficulty, enable_voice, enable_camera, enable_timer = render_sidebar(db)
-    
-    # Store settings in session state
-    st.session_state.model_choice = model_choice
-    st.session_state.difficulty = difficulty
-    st.session_state.enable_voice = enable_voice
-    st.session_state.enable_camera = enable_camera
-    st.session_state.enable_timer = enable_timer
+    # Render sidebar (settings are applied straight into session state)
+    render_sidebar()
     
     # Route to appropriate stage
     if st.session_state.stage == 'input':
@@ -1424,15 +2333,24 @@ def show_input_stage(db: DatabaseManager, llm: LLMService):
         )
         
         if uploaded_file is not None:
-            with st.spinner("📖 Reading PDF..."):
+            with st.status("📖 Reading PDF...") as status:
+                # Parse on a worker thread. Updating the status between polls lets Streamlit
+                # interrupt this run for new input; the next rerun rejoins the same future.
+                future = Utils.start_pdf_extraction(uploaded_file)
+                started = time.time()
+                while future is not None and not future.done():
+                    time.sleep(0.2)
+                    status.update(label=f"📖 Reading PDF... ({time.time() - started:.0f}s)")
                 extracted_text = Utils.extract_text_from_pdf(uploaded_file)
-                if extracted_text:
-                    cv_text_from_pdf = extracted_text
-                    st.success(f"✅ PDF loaded successfully! ({len(cv_text_from_pdf)} characters)")
-                    with st.expander("📄 Preview Extracted Text", expanded=False):
-                        st.text_area("Extracted Content", cv_text_from_pdf, height=200, disabled=True, key="pdf_preview_main")
-                else:
-                    st.error("❌ Failed to extract text from PDF. Please try another file or use Type CV Text option.")
+                status.update(label="📖 PDF read", state="complete" if extracted_text else "error")
+            
+            if extracted_text:
+                cv_text_from_pdf = extracted_text
+                st.success(f"✅ PDF loaded successfully! ({len(cv_text_from_pdf)} characters)")
+                with st.expander("📄 Preview Extracted Text", expanded=False):
+                    st.text_area("Extracted Content", cv_text_from_pdf, height=200, disabled=True, key="pdf_preview_main")
+            else:
+                st.error("❌ Failed to extract text from PDF. Please try another file or use Type CV Text option.")
         else:
             st.info("👆 Please upload your CV in PDF format to continue")
     
@@ -1541,10 +2459,13 @@ Contoh:
                 'job_category': job_category,
                 'experience_years': experience_years,
                 'education_level': education,
-                'skills': skills.split(',') if skills else []
+                'skills': [s for s in _SKILL_RE.split(skills.strip()) if s] if skills else []
             }
             
-            db.save_user_profile(st.session_state.user_id, profile_data)
+            # Profile write runs in the background while the LLM call (the slow part) runs here
+            profile_future = _db_executor().submit(
+                db.upsert_user_profile, st.session_state.user_id, profile_data
+            )
             
             # Generate questions
             analysis_result = llm.analyze_cv_and_generate_questions(
@@ -1553,6 +2474,11 @@ Contoh:
                 st.session_state.difficulty
             )
             
+            try:
+                profile_future.result()
+            except Exception as e:
+                st.error(f"Error saving profile: {str(e)}")
+            
             # Initialize all required state
             st.session_state.cv_text = cv_text
             st.session_state.target_job = target_job
@@ -1571,6 +2497,34 @@ Contoh:
             time.sleep(1)
             st.rerun()
 
+_QUESTION_CARD_HTML = """
+    <div style='background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
+                padding: 2rem; border-radius: 10px; margin: 1rem 0;'>
+        <p style='color: rgba(255,255,255,0.8); margin: 0; font-size: 0.9rem;'>
+            📌 {category} • Difficulty: {difficulty}
+        </p>
+        <h2 style='color: white; margin: 0.5rem 0;'>{question}</h2>
+        <p style='color: rgba(255,255,255,0.7); margin: 0.5rem 0 0 0; font-size: 0.9rem;'>
+            💡 {context}
+        </p>
+    </div>
+"""
+
+def _question_card(current_idx: int, question: Dict) -> str:
+    """Question card markup, built once per question rather than on every rerun"""
+    # Single slot: only the current question's card is ever needed again
+    key = (st.session_state.get('session_id'), current_idx)
+    cached = st.session_state.get('question_card')
+    if cached is None or cached[0] != key:
+        cached = (key, _QUESTION_CARD_HTML.format(
+            category=question['category'].upper(),
+            difficulty=question.get('difficulty', 'medium').upper(),
+            question=question['question'],
+            context=question.get('context', '')
+        ))
+        st.session_state.question_card = cached
+    return cached[1]
+
 def show_interview_stage(db: DatabaseManager, llm: LLMService):
     """Enhanced interview stage with camera and voice"""
     st.header("🎤 Interview in Progress")
@@ -1614,21 +2568,10 @@ def show_interview_stage(db: DatabaseManager, llm: LLMService):
                 """)
         
         # Question card
-        st.markdown(f"""
-            <div style='background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                        padding: 2rem; border-radius: 10px; margin: 1rem 0;'>
-                <p style='color: rgba(255,255,255,0.8); margin: 0; font-size: 0.9rem;'>
-                    📌 {current_q['category'].upper()} • Difficulty: {current_q.get('difficulty', 'medium').upper()}
-                </p>
-                <h2 style='color: white; margin: 0.5rem 0;'>{current_q['question']}</h2>
-                <p style='color: rgba(255,255,255,0.7); margin: 0.5rem 0 0 0; font-size: 0.9rem;'>
-                    💡 {current_q.get('context', '')}
-                </p>
-            </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_question_card(current_idx, current_q), unsafe_allow_html=True)
         
         # Text-to-speech for question
-        if use_voice and gTTS:
+        if use_voice and _get_gtts():
             col_voice1, col_voice2 = st.columns([1, 4])
             with col_voice1:
                 if st.button("🔊 Dengar Pertanyaan", key=f"tts_{current_idx}"):
@@ -1636,16 +2579,19 @@ def show_interview_stage(db: DatabaseManager, llm: LLMService):
                         audio_bytes = Utils.text_to_speech(current_q['question'])
                         if audio_bytes:
                             st.audio(audio_bytes, format='audio/mp3')
+            
+            # Synthesize the next question while this one is being answered
+            if current_idx + 1 < total_questions:
+                Utils.prefetch_speech(st.session_state.questions[current_idx + 1]['question'])
         
         # Expected points (collapsible)
         with st.expander("🎯 Poin yang Diharapkan"):
-            for point in current_q.get('expected_answer_points', []):
-                st.write(f"• {point}")
+            _write_bullets(current_q.get('expected_answer_points', []))
         
         st.markdown("---")
         
         # Answer input
-        if use_voice and gTTS:
+        if use_voice and _get_gtts():
             tab1, tab2 = st.tabs(["✏️ Type Answer", "🎤 Voice Answer"])
         else:
             tab1, tab2 = st.tabs(["✏️ Type Answer", "🎤 Voice Answer (Install required)"])
@@ -1668,7 +2614,7 @@ def show_interview_stage(db: DatabaseManager, llm: LLMService):
                 st.markdown(f"<p style='text-align: right; color: {color};'>{char_count} / {CONFIG.min_answer_length} characters</p>", unsafe_allow_html=True)
         
         with tab2:
-            if gTTS:
+            if _get_gtts():
                 st.info("🎙️ **Voice Recording Feature**")
                 st.write("Record your answer using the audio recorder below:")
                 
@@ -1761,46 +2707,110 @@ def show_results_stage(db: DatabaseManager, llm: LLMService):
     """Enhanced results stage with comprehensive feedback"""
     st.header("📊 Interview Results & Feedback")
     
-    with st.spinner("🔄 Evaluating your interview performance..."):
-        interview_duration = int(time.time() - st.session_state.interview_start_time)
-        
-        evaluation = llm.evaluate_full_interview(
-            st.session_state.questions,
-            st.session_state.answers,
-            st.session_state.cv_text,
-            st.session_state.target_job
-        )
-        
-        scores = evaluation['scores']
+    # Job market is known up front, so job recommendations only wait for the scores
+    job_market_list = db.get_job_market()
+    recs_future = None
+    
+    def start_job_recommendations(category_scores: Dict) -> Future:
+        # Stable key order/number format so streamed and cached scores share one prompt
+        rec_scores = {k: float(v) for k, v in sorted(category_scores.items())}
+        return llm.submit_job_recommendations(st.session_state.cv_text, rec_scores, job_market_list)
+    
+    # One pass over the answers; reused for the stored count, the Q&A rows and the metric
+    answered_indices = [i for i, a in enumerate(st.session_state.answers) if a != "[Skipped]"]
+    answered_count = len(answered_indices)
+    
+    # The evaluation is kept per session, so widget reruns (downloads, sidebar settings)
+    # redraw the page without calling the model again
+    session_id = st.session_state.session_id
+    results = st.session_state.get(f"results_{session_id}")
+    
+    if results is None:
+        with st.spinner("🔄 Evaluating your interview performance..."):
+            interview_duration = int(time.time() - st.session_state.interview_start_time)
+            
+            # Show category scores as they stream in; once all are in, start job recommendations
+            # while the rest of the evaluation is still generating
+            score_slot = st.empty()
+            streamed_scores = {}
+            
+            def show_score(category: str, score: float):
+                nonlocal recs_future
+                streamed_scores[category] = score
+                score_slot.caption(" · ".join(
+                    f"{_category_label(k)}: {v:.0f}" for k, v in streamed_scores.items()
+                ))
+                if recs_future is None and len(streamed_scores) == len(_SCORE_KEYS):
+                    recs_future = start_job_recommendations(streamed_scores)
+            
+            # Overall assessment, strengths and weaknesses, overwritten as they grow
+            text_slot = st.empty()
+            streamed_text = {}
+            
+            def show_text(field: str, value):
+                streamed_text[field] = value
+                parts = [streamed_text.get('overall_assessment', '')]
+                for key, title in (('strengths', "**✅ Strengths**"), ('weaknesses', "**⚠️ Areas for Improvement**")):
+                    if streamed_text.get(key):
+                        parts.append(title + "\n" + "\n".join(f"- {item}" for item in streamed_text[key]))
+                text_slot.markdown("\n\n".join(part for part in parts if part))
+            
+            evaluation = llm.evaluate_full_interview(
+                st.session_state.questions,
+                st.session_state.answers,
+                st.session_state.cv_text,
+                st.session_state.target_job,
+                on_score=show_score,
+                on_text=show_text
+            )
+            score_slot.empty()
+            text_slot.empty()
+        
+        results = {'evaluation': evaluation, 'duration': interview_duration, 'recommendations': None}
+        st.session_state[f"results_{session_id}"] = results
+    
+    evaluation = results['evaluation']
+    interview_duration = results['duration']
+    scores = evaluation['scores']
+    if recs_future is None and results['recommendations'] is None:
+        recs_future = start_job_recommendations(scores)
+    
+    # Persist exactly once per session; reruns would otherwise hit UNIQUE(session_id)
+    # and append a duplicate set of qa_history rows
+    if not st.session_state.get(f"results_saved_{session_id}"):
+        # Compact transcript: only what is read back, not the full question dicts
+        transcript = [
+            {'q': q['question'], 'a': a, 'cat': q['category'], 'rt': meta.get('response_time', 0)}
+            for q, a, meta in zip(st.session_state.questions, st.session_state.answers,
+                                  st.session_state.answer_metadata)
+        ]
         
         result_data = {
             'job_title': st.session_state.target_job,
             'difficulty': st.session_state.difficulty,
             'scores': scores,
             'duration': interview_duration,
-            'questions_answered': len([a for a in st.session_state.answers if a != "[Skipped]"]),
-            'transcript': json.dumps(list(zip(st.session_state.questions, st.session_state.answers))),
-            'detailed_feedback': json.dumps(evaluation),
-            'recommendations': json.dumps(evaluation.get('recommendation', {}))
+            'questions_answered': answered_count,
+            'transcript': json_dumps(transcript),
+            'detailed_feedback': json_dumps(evaluation),
+            'recommendations': json_dumps(evaluation.get('recommendation', {}))
         }
         
-        db.save_interview_result(
-            st.session_state.session_id,
-            st.session_state.user_id,
-            result_data
-        )
-        
-        for i, (q, a) in enumerate(zip(st.session_state.questions, st.session_state.answers)):
-            if a != "[Skipped]":
-                qa_data = {
+        if db.save_interview_result(session_id, st.session_state.user_id, result_data):
+            pending_qas = []
+            for i in answered_indices:
+                entry = transcript[i]
+                pending_qas.append({
                     'user_id': st.session_state.user_id,
                     'question_id': i,
-                    'category': q['category'],
-                    'question': q['question'],
-                    'answer': a,
-                    'response_time': st.session_state.answer_metadata[i]['response_time']
-                }
-                db.save_qa_pair(st.session_state.session_id, qa_data)
+                    'category': entry['cat'],
+                    'question': entry['q'],
+                    'answer': entry['a'],
+                    'response_time': entry['rt']
+                })
+            db.save_qa_pairs_bulk(session_id, pending_qas)
+            # Only after the result row exists, so a failed save is retried on the next rerun
+            st.session_state[f"results_saved_{session_id}"] = True
     
     avg_score = sum(scores.values()) / len(scores)
     grade = Utils.calculate_grade(avg_score)
@@ -1832,31 +2842,23 @@ def show_results_stage(db: DatabaseManager, llm: LLMService):
     with col3:
         st.metric("Duration", Utils.format_duration(interview_duration))
     with col4:
-        answered = len([a for a in st.session_state.answers if a != "[Skipped]"])
-        st.metric("Answered", f"{answered}/{len(st.session_state.questions)}")
+        st.metric("Answered", f"{answered_count}/{len(st.session_state.questions)}")
     
     st.markdown("---")
     
     st.subheader("📊 Score Breakdown")
     
+    radar_fig, gauge_fig, bar_fig = _results_charts(tuple(scores.items()), avg_score)
+    
     col1, col2 = st.columns(2)
     
     with col1:
-        st.plotly_chart(
-            VisualizationService.create_radar_chart(scores),
-            use_container_width=True
-        )
+        st.plotly_chart(radar_fig, use_container_width=True)
     
     with col2:
-        st.plotly_chart(
-            VisualizationService.create_gauge_chart(avg_score),
-            use_container_width=True
-        )
+        st.plotly_chart(gauge_fig, use_container_width=True)
     
-    st.plotly_chart(
-        VisualizationService.create_bar_chart(scores),
-        use_container_width=True
-    )
+    st.plotly_chart(bar_fig, use_container_width=True)
     
     st.markdown("---")
     
@@ -1865,7 +2867,7 @@ def show_results_stage(db: DatabaseManager, llm: LLMService):
     category_feedback = evaluation.get('category_feedback', {})
     
     for category, score in scores.items():
-        with st.expander(f"{'🟢' if score >= 75 else '🟡' if score >= 60 else '🔴'} {category.replace('_', ' ').title()} - {score:.0f}/100"):
+        with st.expander(f"{'🟢' if score >= 75 else '🟡' if score >= 60 else '🔴'} {_category_label(category)} - {score:.0f}/100"):
             feedback_text = category_feedback.get(category, "No specific feedback available")
             st.write(feedback_text)
             
@@ -1884,19 +2886,16 @@ def show_results_stage(db: DatabaseManager, llm: LLMService):
     
     with col1:
         st.success("**✅ Strengths**")
-        for strength in evaluation.get('strengths', []):
-            st.write(f"• {strength}")
+        _write_bullets(evaluation.get('strengths', []))
     
     with col2:
         st.warning("**⚠️ Areas for Improvement**")
-        for weakness in evaluation.get('weaknesses', []):
-            st.write(f"• {weakness}")
+        _write_bullets(evaluation.get('weaknesses', []))
     
     red_flags = evaluation.get('red_flags', [])
     if red_flags:
         st.error("**🚩 Concerns**")
-        for flag in red_flags:
-            st.write(f"• {flag}")
+        _write_bullets(red_flags)
     
     st.markdown("---")
     
@@ -1922,8 +2921,7 @@ def show_results_stage(db: DatabaseManager, llm: LLMService):
     
     if next_steps:
         st.write("**Suggested Next Steps:**")
-        for step in next_steps:
-            st.write(f"• {step}")
+        _write_bullets(next_steps)
     
     st.markdown("---")
     
@@ -1934,13 +2932,11 @@ def show_results_stage(db: DatabaseManager, llm: LLMService):
     
     with col1:
         st.write("**Priority Areas:**")
-        for area in dev_plan.get('priority_areas', []):
-            st.write(f"• {area}")
+        _write_bullets(dev_plan.get('priority_areas', []))
     
     with col2:
         st.write("**Suggested Actions:**")
-        for action in dev_plan.get('suggested_actions', []):
-            st.write(f"• {action}")
+        _write_bullets(dev_plan.get('suggested_actions', []))
     
     if 'timeline' in dev_plan:
         st.info(f"⏱️ **Recommended Timeline:** {dev_plan['timeline']}")
@@ -1949,18 +2945,11 @@ def show_results_stage(db: DatabaseManager, llm: LLMService):
     
     st.subheader("💼 Job Recommendations")
     
-    with st.spinner("🔍 Finding matching jobs..."):
-        conn = db.get_connection()
-        job_market = pd.read_sql_query("SELECT * FROM job_market", conn)
-        conn.close()
-        
-        job_market_list = job_market.to_dict('records')
-        
-        recommendations = llm.get_job_recommendations(
-            st.session_state.cv_text,
-            scores,
-            job_market_list
-        )
+    recommendations = results['recommendations']
+    if recommendations is None:
+        with st.spinner("🔍 Finding matching jobs..."):
+            recommendations = llm.job_recommendations_result(recs_future)
+        results['recommendations'] = recommendations
     
     if recommendations:
         for i, rec in enumerate(recommendations[:5], 1):
@@ -1972,13 +2961,11 @@ def show_results_stage(db: DatabaseManager, llm: LLMService):
                 
                 with col1:
                     st.write(f"**Why it's a good fit:**")
-                    for reason in rec.get('match_reasons', []):
-                        st.write(f"• {reason}")
+                    _write_bullets(rec.get('match_reasons', []))
                     
                     if rec.get('skill_gaps'):
                         st.write(f"\n**Skills to develop:**")
-                        for gap in rec['skill_gaps']:
-                            st.write(f"• {gap}")
+                        _write_bullets(rec['skill_gaps'])
                 
                 with col2:
                     st.metric("Salary Range", rec.get('salary_range', 'N/A'))
@@ -1995,10 +2982,11 @@ def show_results_stage(db: DatabaseManager, llm: LLMService):
     
     with col1:
         if st.button("🔄 New Interview", type="primary", use_container_width=True):
-            for key in ['questions', 'answers', 'answer_metadata', 'current_question_idx', 
-                       'interview_start_time', 'question_start_time', 'session_id']:
-                if key in st.session_state:
-                    del st.session_state[key]
+            # Defaults are only applied on a session's first run, so reset rather than delete
+            for key in _INTERVIEW_STATE_KEYS:
+                st.session_state[key] = copy.copy(_SESSION_DEFAULTS[key])
+            st.session_state.pop(f"results_{session_id}", None)
+            st.session_state.pop('session_id', None)
             st.session_state.stage = 'input'
             st.rerun()
     
@@ -2032,13 +3020,24 @@ def show_results_stage(db: DatabaseManager, llm: LLMService):
                 use_container_width=True
             )
 
+_HISTORY_PAGE_SIZE = 20
+
+def _reset_history_page():
+    """Filter change callback: start the record list over from the first page"""
+    st.session_state.page = 0
+
+def _shift_history_page(step: int):
+    """Pagination button callback"""
+    st.session_state.page = max(0, st.session_state.page + step)
+
+@st.fragment
 def show_history_stage(db: DatabaseManager):
-    """Enhanced history view with filters"""
+    """Enhanced history view with filters; filter and page changes rerun only this fragment"""
     st.header("📚 Interview History")
     
-    history = db.get_user_history(st.session_state.user_id, limit=50)
+    summary = db.get_history_summary(st.session_state.user_id)
     
-    if not history:
+    if not summary.total:
         st.info("🔭 No interview history yet. Start your first interview!")
         if st.button("🚀 Start Interview"):
             st.session_state.stage = 'input'
@@ -2047,16 +3046,11 @@ def show_history_stage(db: DatabaseManager):
     
     st.subheader("📊 Summary Statistics")
     
-    total = len(history)
-    avg_score = sum(h['total_score'] for h in history) / total if total > 0 else 0
-    passed = sum(1 for h in history if h['pass_status'])
-    pass_rate = (passed / total * 100) if total > 0 else 0
-    
     col1, col2, col3, col4 = st.columns(4)
-    col1.metric("Total Interviews", total)
-    col2.metric("Average Score", f"{avg_score:.1f}")
-    col3.metric("Passed", passed)
-    col4.metric("Pass Rate", f"{pass_rate:.1f}%")
+    col1.metric("Total Interviews", summary.total)
+    col2.metric("Average Score", f"{summary.avg_score:.1f}")
+    col3.metric("Passed", summary.passed)
+    col4.metric("Pass Rate", f"{summary.pass_rate:.1f}%")
     
     st.markdown("---")
     
@@ -2066,35 +3060,41 @@ def show_history_stage(db: DatabaseManager):
     with col1:
         job_filter = st.selectbox(
             "Filter by Job",
-            ["All"] + list(set(h['job_title'] for h in history))
+            ["All", *summary.job_titles],
+            on_change=_reset_history_page
         )
     
     with col2:
         difficulty_filter = st.selectbox(
             "Filter by Difficulty",
-            ["All"] + list(set(h['difficulty_level'] for h in history if h['difficulty_level']))
+            ["All", *summary.difficulty_levels],
+            on_change=_reset_history_page
         )
     
     with col3:
         status_filter = st.selectbox(
             "Filter by Status",
-            ["All", "Passed", "Failed"]
+            ["All", "Passed", "Failed"],
+            on_change=_reset_history_page
         )
     
-    filtered_history = history
-    if job_filter != "All":
-        filtered_history = [h for h in filtered_history if h['job_title'] == job_filter]
-    if difficulty_filter != "All":
-        filtered_history = [h for h in filtered_history if h['difficulty_level'] == difficulty_filter]
-    if status_filter != "All":
-        if status_filter == "Passed":
-            filtered_history = [h for h in filtered_history if h['pass_status']]
-        else:
-            filtered_history = [h for h in filtered_history if not h['pass_status']]
+    # Filtering and paging happen in SQL; one extra row tells whether a next page exists
+    page = st.session_state.page
+    filtered_history = db.get_history(
+        st.session_state.user_id,
+        pass_only=None if status_filter == "All" else status_filter == "Passed",
+        job_title=None if job_filter == "All" else job_filter,
+        difficulty=None if difficulty_filter == "All" else difficulty_filter,
+        limit=_HISTORY_PAGE_SIZE + 1,
+        offset=page * _HISTORY_PAGE_SIZE
+    )
+    has_next = len(filtered_history) > _HISTORY_PAGE_SIZE
+    filtered_history = filtered_history[:_HISTORY_PAGE_SIZE]
     
     st.markdown("---")
     
-    st.subheader(f"📋 Interview Records ({len(filtered_history)})")
+    first = page * _HISTORY_PAGE_SIZE
+    st.subheader(f"📋 Interview Records ({first + 1 if filtered_history else 0}-{first + len(filtered_history)})")
     
     for record in filtered_history:
         status_icon = "✅" if record['pass_status'] else "❌"
@@ -2106,17 +3106,12 @@ def show_history_stage(db: DatabaseManager):
             
             with col1:
                 st.write("**Score Breakdown:**")
-                score_cols = st.columns(4)
-                score_cols[0].metric("Communication", f"{record['komunikasi']:.0f}")
-                score_cols[1].metric("Problem Solving", f"{record['problem_solving']:.0f}")
-                score_cols[2].metric("Leadership", f"{record['leadership']:.0f}")
-                score_cols[3].metric("Teamwork", f"{record['teamwork']:.0f}")
-                
-                score_cols2 = st.columns(4)
-                score_cols2[0].metric("Technical", f"{record['pengetahuan_teknis']:.0f}")
-                score_cols2[1].metric("Adaptability", f"{record['adaptabilitas']:.0f}")
-                score_cols2[2].metric("Creativity", f"{record['kreativitas']:.0f}")
-                score_cols2[3].metric("Critical Think", f"{record['critical_thinking']:.0f}")
+                # One table element per record instead of eight metrics in two column rows
+                st.dataframe(
+                    [dict(zip(_SCORE_TABLE_LABELS, (round(v) for v in _SCORE_GET(record))))],
+                    hide_index=True,
+                    use_container_width=True
+                )
             
             with col2:
                 st.metric("Overall Score", f"{record['total_score']:.1f}/100")
@@ -2124,33 +3119,43 @@ def show_history_stage(db: DatabaseManager):
                 st.metric("Questions", record['questions_answered'])
                 st.metric("Status", "PASSED ✅" if record['pass_status'] else "FAILED ❌")
             
-            if record['detailed_feedback']:
+            # Expanders render their body even when collapsed (and can't be nested), so the
+            # feedback blob is only parsed once this record's toggle is switched on
+            if record['detailed_feedback'] and st.toggle(
+                "📝 View Detailed Feedback", key=f"fb_open_{record['session_id']}"
+            ):
                 try:
-                    feedback = json.loads(record['detailed_feedback'])
+                    feedback = json_loads(record['detailed_feedback'])
+                    
+                    st.write("**Overall Assessment:**")
+                    st.info(feedback.get('overall_assessment', 'N/A'))
                     
-                    with st.expander("📝 View Detailed Feedback"):
-                        st.write("**Overall Assessment:**")
-                        st.info(feedback.get('overall_assessment', 'N/A'))
-                        
-                        col_fb1, col_fb2 = st.columns(2)
-                        with col_fb1:
-                            st.write("**Strengths:**")
-                            for s in feedback.get('strengths', []):
-                                st.write(f"• {s}")
-                        with col_fb2:
-                            st.write("**Improvements:**")
-                            for w in feedback.get('weaknesses', []):
-                                st.write(f"• {w}")
+                    col_fb1, col_fb2 = st.columns(2)
+                    with col_fb1:
+                        st.write("**Strengths:**")
+                        _write_bullets(feedback.get('strengths', []))
+                    with col_fb2:
+                        st.write("**Improvements:**")
+                        _write_bullets(feedback.get('weaknesses', []))
                 except:
                     pass
+    
+    if page or has_next:
+        col_prev, col_page, col_next = st.columns([1, 2, 1])
+        col_prev.button("⬅️ Newer", on_click=_shift_history_page, args=(-1,),
+                        disabled=page == 0, use_container_width=True)
+        col_page.caption(f"Page {page + 1}")
+        col_next.button("Older ➡️", on_click=_shift_history_page, args=(1,),
+                        disabled=not has_next, use_container_width=True)
 
+@st.fragment
 def show_analytics_stage(db: DatabaseManager):
-    """Enhanced analytics dashboard"""
+    """Enhanced analytics dashboard, rerun as a fragment on its own widget changes"""
     st.header("📈 Analytics Dashboard")
     
     analytics = db.get_analytics_data(st.session_state.user_id)
     
-    if analytics['total_interviews'] == 0:
+    if analytics.total_interviews == 0:
         st.info("📊 No analytics data yet. Complete some interviews to see your progress!")
         if st.button("🚀 Start Interview"):
             st.session_state.stage = 'input'
@@ -2160,14 +3165,11 @@ def show_analytics_stage(db: DatabaseManager):
     st.subheader("🎯 Key Performance Indicators")
     
     col1, col2, col3, col4 = st.columns(4)
-    col1.metric("Total Interviews", analytics['total_interviews'])
-    col2.metric("Average Score", f"{analytics['avg_score']:.1f}/100")
-    col3.metric(
-        "Improvement Rate",
-        f"{analytics['improvement_rate']:+.1f}%",
-        delta=f"{analytics['improvement_rate']:.1f}%"
-    )
-    col4.metric("Current Grade", Utils.calculate_grade(analytics['avg_score']))
+    col1.metric("Total Interviews", analytics.total_interviews)
+    col2.metric("Average Score", f"{analytics.avg_score:.1f}/100")
+    rate_text = f"{analytics.improvement_rate:+.1f}%"
+    col3.metric("Improvement Rate", rate_text, delta=rate_text)
+    col4.metric("Current Grade", Utils.calculate_grade(analytics.avg_score))
     
     st.markdown("---")
     
@@ -2177,12 +3179,12 @@ def show_analytics_stage(db: DatabaseManager):
     
     with col1:
         st.success("**🌟 Strongest Area**")
-        strongest = analytics['strongest_area']
+        strongest = analytics.strongest_area
         st.metric(strongest[0], f"{strongest[1]:.1f}/100")
     
     with col2:
         st.warning("**📚 Area to Improve**")
-        weakest = analytics['weakest_area']
+        weakest = analytics.weakest_area
         st.metric(weakest[0], f"{weakest[1]:.1f}/100")
     
     st.markdown("---")
@@ -2197,7 +3199,7 @@ def show_analytics_stage(db: DatabaseManager):
     
     st.subheader("📊 Category Performance")
     
-    category_scores = analytics['category_scores']
+    category_scores = analytics.category_scores
     st.plotly_chart(
         VisualizationService.create_bar_chart(category_scores, "Average Score by Category"),
         use_container_width=True
@@ -2207,7 +3209,7 @@ def show_analytics_stage(db: DatabaseManager):
     
     st.subheader("💡 Personalized Recommendations")
     
-    if analytics['improvement_rate'] < 0:
+    if analytics.improvement_rate < 0:
         st.warning("""
         **📉 Your scores are declining**
         
@@ -2216,7 +3218,7 @@ def show_analytics_stage(db: DatabaseManager):
         - Focus on your weakest areas
         - Practice with easier difficulty levels first
         """)
-    elif analytics['improvement_rate'] > 10:
+    elif analytics.improvement_rate > 10:
         st.success("""
         **🚀 Great progress!**
         
@@ -1,16 +1,55 @@
+import hashlib
+import json
 import sqlite3
+import threading
 import os
 
+import streamlit as st
+
+# db_paths whose schema has already been created in this process
+_initialized = set()
+_init_lock = threading.Lock()
+
+# Satu koneksi per thread (seperti DatabaseManager di Interview.py): transaksi sebuah
+# sesi Streamlit tidak pernah menelan atau meng-commit statement milik thread lain
+_local = threading.local()
+
+# 8 KiB pages suit the row-heavy analytics reads better than SQLite's 4 KiB default
+_PAGE_SIZE = 8192
+
+
+def _thread_connection(db_path: str) -> sqlite3.Connection:
+    """This thread's long-lived connection to db_path, reused across reruns"""
+    conns = getattr(_local, 'conns', None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(db_path)
+    if conn is None:
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        # page_size only applies to a new (empty) file; existing files keep theirs (convert offline with VACUUM)
+        conn.executescript(f'''PRAGMA page_size={_PAGE_SIZE};
+                              PRAGMA journal_mode=WAL;
+                              PRAGMA synchronous=NORMAL;
+                              PRAGMA busy_timeout=5000;
+                              PRAGMA temp_store=MEMORY;
+                              PRAGMA mmap_size=1073741824;
+                              PRAGMA cache_size=-65536;''')
+        conns[db_path] = conn
+    return conn
+
+
 class DatabaseManager:
     def __init__(self, db_path: str = 'interview_training.db'):
         self.db_path = db_path
-        self.init_database()
+        with _init_lock:
+            if db_path not in _initialized:
+                self.init_database()
+                _initialized.add(db_path)
 
     def get_connection(self):
-        """Get database connection with proper settings"""
-        conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Get this thread's database connection (WAL, tuned PRAGMAs)"""
+        return _thread_connection(self.db_path)
 
     def init_database(self):
         """Initialize database with enhanced schema"""
@@ -83,7 +122,7 @@ class DatabaseManager:
 
         cursor.execute('''CREATE TABLE IF NOT EXISTS job_market (
                             id INTEGER PRIMARY KEY AUTOINCREMENT,
-                            job_title TEXT NOT NULL,
+                            job_title TEXT NOT NULL UNIQUE,
                             category TEXT,
                             avg_salary_min INTEGER,
                             avg_salary_max INTEGER,
@@ -92,49 +131,134 @@ class DatabaseManager:
                             description TEXT,
                             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
 
+        # Per-user category rollup of qa_history, kept current by triggers so analytics
+        # reads one row per category instead of aggregating the whole history
+        cursor.execute('''CREATE TABLE IF NOT EXISTS user_category_stats (
+                            user_id TEXT NOT NULL,
+                            category TEXT NOT NULL,
+                            sum_score REAL NOT NULL DEFAULT 0,
+                            count INTEGER NOT NULL DEFAULT 0,
+                            PRIMARY KEY (user_id, category))''')
+
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'qa_hist_rollup'")
+        if cursor.fetchone() is None:
+            with conn:
+                # Backfill rows written before the triggers existed; AVG semantics: NULL scores don't count
+                cursor.execute('DELETE FROM user_category_stats')
+                cursor.execute('''INSERT INTO user_category_stats (user_id, category, sum_score, count)
+                                  SELECT user_id, category, COALESCE(SUM(score), 0), COUNT(score)
+                                  FROM qa_history WHERE category IS NOT NULL
+                                  GROUP BY user_id, category''')
+                cursor.execute('''CREATE TRIGGER qa_hist_rollup AFTER INSERT ON qa_history
+                                  WHEN NEW.category IS NOT NULL
+                                  BEGIN
+                                      INSERT INTO user_category_stats (user_id, category, sum_score, count)
+                                      VALUES (NEW.user_id, NEW.category, COALESCE(NEW.score, 0), NEW.score IS NOT NULL)
+                                      ON CONFLICT (user_id, category) DO UPDATE SET
+                                          sum_score = sum_score + excluded.sum_score,
+                                          count = count + excluded.count;
+                                  END''')
+                cursor.execute('''CREATE TRIGGER IF NOT EXISTS qa_hist_rollup_delete AFTER DELETE ON qa_history
+                                  WHEN OLD.category IS NOT NULL
+                                  BEGIN
+                                      UPDATE user_category_stats
+                                      SET sum_score = sum_score - COALESCE(OLD.score, 0),
+                                          count = count - (OLD.score IS NOT NULL)
+                                      WHERE user_id = OLD.user_id AND category = OLD.category;
+                                  END''')
+
+        # Per-user running mean of total_score, updated O(1) per insert (running-mean update)
+        cursor.execute('''CREATE TABLE IF NOT EXISTS user_score_stats (
+                            user_id TEXT PRIMARY KEY,
+                            interviews_n INTEGER NOT NULL DEFAULT 0,
+                            mean_score REAL NOT NULL DEFAULT 0,
+                            first_score REAL)''')
+
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'ir_score_rollup'")
+        if cursor.fetchone() is None:
+            with conn:
+                cursor.execute('DELETE FROM user_score_stats')
+                cursor.execute('''INSERT INTO user_score_stats (user_id, interviews_n, mean_score, first_score)
+                                  SELECT user_id, COUNT(*), AVG(COALESCE(total_score, 0)),
+                                         (SELECT COALESCE(f.total_score, 0) FROM interview_results f
+                                          WHERE f.user_id = ir.user_id
+                                          ORDER BY f.created_at ASC, f.id ASC LIMIT 1)
+                                  FROM interview_results ir GROUP BY user_id''')
+                cursor.execute('''CREATE TRIGGER ir_score_rollup AFTER INSERT ON interview_results
+                                  BEGIN
+                                      INSERT INTO user_score_stats (user_id, interviews_n, mean_score, first_score)
+                                      VALUES (NEW.user_id, 1, COALESCE(NEW.total_score, 0), COALESCE(NEW.total_score, 0))
+                                      ON CONFLICT (user_id) DO UPDATE SET
+                                          mean_score = mean_score + (excluded.mean_score - mean_score) / (interviews_n + 1),
+                                          interviews_n = interviews_n + 1;
+                                  END''')
+                # Penghapusan jarang terjadi: rata-rata dikurangi, skor pertama dicari ulang lewat index
+                cursor.execute('''CREATE TRIGGER IF NOT EXISTS ir_score_rollup_delete AFTER DELETE ON interview_results
+                                  BEGIN
+                                      UPDATE user_score_stats
+                                      SET mean_score = CASE WHEN interviews_n > 1
+                                                            THEN (mean_score * interviews_n - COALESCE(OLD.total_score, 0))
+                                                                 / (interviews_n - 1)
+                                                            ELSE 0 END,
+                                          interviews_n = interviews_n - 1,
+                                          first_score = (SELECT COALESCE(total_score, 0) FROM interview_results
+                                                         WHERE user_id = OLD.user_id
+                                                         ORDER BY created_at ASC, id ASC LIMIT 1)
+                                      WHERE user_id = OLD.user_id;
+                                      DELETE FROM user_score_stats WHERE user_id = OLD.user_id AND interviews_n <= 0;
+                                  END''')
+
         # Create indexes for better performance
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_id ON interview_results(user_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_ir_user_created ON interview_results(user_id, created_at DESC)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_session_id ON qa_history(session_id)')
+        # Covers the per-user GROUP BY category / AVG(score) in get_analytics_data
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_qa_user_cat_score ON qa_history(user_id, category, score)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_created_at ON interview_results(created_at)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_cv_hash ON user_profiles(cv_hash)')
+
+        # Databases created before job_title was declared UNIQUE
+        cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_job_market_title ON job_market(job_title)')
 
-        conn.commit()
-        conn.close()
+        # Superseded by idx_ir_user_created
+        cursor.execute('DROP INDEX IF EXISTS idx_user_id')
+
+        # Refresh planner statistics so the composite indexes get picked
+        cursor.execute('ANALYZE')
         
     def seed_job_market_data(self):
         """Seed initial job market data"""
         conn = self.get_connection()
         cursor = conn.cursor()
 
-        cursor.execute('SELECT COUNT(*) FROM job_market')
-        if cursor.fetchone()[0] == 0:
-            jobs = [
-                ("Software Engineer", "Teknologi", 12000000, 25000000, "Tinggi", 
-                 "Python,Java,JavaScript,SQL,Git", "Mengembangkan dan memelihara aplikasi software"),
-                ("Data Scientist", "Teknologi", 15000000, 30000000, "Sangat Tinggi",
-                 "Python,R,SQL,Machine Learning,Statistics", "Analisis data dan machine learning"),
-                ("Product Manager", "Manajemen", 15000000, 35000000, "Tinggi",
-                 "Product Strategy,Agile,Communication,Analytics", "Mengelola lifecycle produk"),
-                ("UX Designer", "Kreatif", 10000000, 20000000, "Sedang",
-                 "Figma,Adobe XD,User Research,Prototyping", "Desain pengalaman pengguna"),
-                ("Digital Marketing", "Marketing", 8000000, 18000000, "Tinggi",
-                 "SEO,SEM,Social Media,Content Marketing,Analytics", "Strategi marketing digital"),
-                ("Business Analyst", "Operasional", 10000000, 22000000, "Tinggi",
-                 "SQL,Excel,Data Analysis,Business Intelligence", "Analisis bisnis dan requirements"),
-                ("DevOps Engineer", "Teknologi", 14000000, 28000000, "Sangat Tinggi",
-                 "Docker,Kubernetes,AWS,CI/CD,Linux", "Automation dan infrastructure"),
-                ("HR Manager", "HR", 12000000, 25000000, "Sedang",
-                 "Recruitment,Employee Relations,HRIS,Labor Law", "Manajemen sumber daya manusia"),
-                ("Sales Manager", "Penjualan", 10000000, 30000000, "Tinggi",
-                 "Negotiation,CRM,Sales Strategy,Communication", "Manajemen tim penjualan"),
-                ("Financial Analyst", "Keuangan", 10000000, 22000000, "Sedang",
-                 "Financial Modeling,Excel,Accounting,Analysis", "Analisis keuangan perusahaan"),
-            ]
-            cursor.executemany('''INSERT INTO job_market (job_title, category, avg_salary_min, avg_salary_max, 
-                                                         demand_level, required_skills, description)
-                                  VALUES (?, ?, ?, ?, ?, ?, ?)''', jobs)
-            conn.commit()
+        jobs = [
+            ("Software Engineer", "Teknologi", 12000000, 25000000, "Tinggi", 
+             "Python,Java,JavaScript,SQL,Git", "Mengembangkan dan memelihara aplikasi software"),
+            ("Data Scientist", "Teknologi", 15000000, 30000000, "Sangat Tinggi",
+             "Python,R,SQL,Machine Learning,Statistics", "Analisis data dan machine learning"),
+            ("Product Manager", "Manajemen", 15000000, 35000000, "Tinggi",
+             "Product Strategy,Agile,Communication,Analytics", "Mengelola lifecycle produk"),
+            ("UX Designer", "Kreatif", 10000000, 20000000, "Sedang",
+             "Figma,Adobe XD,User Research,Prototyping", "Desain pengalaman pengguna"),
+            ("Digital Marketing", "Marketing", 8000000, 18000000, "Tinggi",
+             "SEO,SEM,Social Media,Content Marketing,Analytics", "Strategi marketing digital"),
+            ("Business Analyst", "Operasional", 10000000, 22000000, "Tinggi",
+             "SQL,Excel,Data Analysis,Business Intelligence", "Analisis bisnis dan requirements"),
+            ("DevOps Engineer", "Teknologi", 14000000, 28000000, "Sangat Tinggi",
+             "Docker,Kubernetes,AWS,CI/CD,Linux", "Automation dan infrastructure"),
+            ("HR Manager", "HR", 12000000, 25000000, "Sedang",
+             "Recruitment,Employee Relations,HRIS,Labor Law", "Manajemen sumber daya manusia"),
+            ("Sales Manager", "Penjualan", 10000000, 30000000, "Tinggi",
+             "Negotiation,CRM,Sales Strategy,Communication", "Manajemen tim penjualan"),
+            ("Financial Analyst", "Keuangan", 10000000, 22000000, "Sedang",
+             "Financial Modeling,Excel,Accounting,Analysis", "Analisis keuangan perusahaan"),
+        ]
 
-        conn.close()
+        # Idempotent via the UNIQUE job_title; one write transaction, committed on exit
+        with conn:
+            cursor.execute('BEGIN IMMEDIATE')
+            cursor.executemany('''INSERT OR IGNORE INTO job_market (job_title, category, avg_salary_min, avg_salary_max, 
+                                                                   demand_level, required_skills, description)
+                                  VALUES (?, ?, ?, ?, ?, ?, ?)''', jobs)
 
     def save_user_profile(self, user_id: str, profile_data: dict) -> bool:
         """Save or update user profile"""
@@ -142,49 +266,85 @@ class DatabaseManager:
             conn = self.get_connection()
             cursor = conn.cursor()
 
-            cursor.execute('''INSERT OR REPLACE INTO user_profiles 
-                            (user_id, email, full_name, cv_text, target_job, job_category, experience_years, education_level, 
-                             skills, preferences, updated_at)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)''', (
-                user_id, profile_data.get('email'), profile_data.get('full_name'), profile_data['cv_text'],
+            cv_hash = hashlib.blake2b(profile_data['cv_text'].encode('utf-8'), digest_size=16).hexdigest()
+            fields = (
+                profile_data.get('email'), profile_data.get('full_name'),
                 profile_data['target_job'], profile_data.get('job_category'),
                 profile_data.get('experience_years', 0), profile_data.get('education_level'),
                 ','.join(profile_data.get('skills', [])), json.dumps(profile_data.get('preferences', {}))
-            ))
+            )
 
-            conn.commit()
-            conn.close()
+            with conn:
+                cursor.execute('SELECT cv_hash FROM user_profiles WHERE user_id = ?', (user_id,))
+                row = cursor.fetchone()
+                if row is not None and row['cv_hash'] == cv_hash:
+                    # CV tidak berubah: perbarui kolom lain tanpa menulis ulang cv_text
+                    cursor.execute('''UPDATE user_profiles
+                                    SET email = ?, full_name = ?, target_job = ?, job_category = ?,
+                                        experience_years = ?, education_level = ?, skills = ?, preferences = ?,
+                                        updated_at = CURRENT_TIMESTAMP
+                                    WHERE user_id = ?''', fields + (user_id,))
+                else:
+                    cursor.execute('''INSERT OR REPLACE INTO user_profiles 
+                                    (user_id, cv_text, cv_hash, email, full_name, target_job, job_category, experience_years, 
+                                     education_level, skills, preferences, updated_at)
+                                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)''',
+                                   (user_id, profile_data['cv_text'], cv_hash) + fields)
             return True
         except Exception as e:
             print(f"Error saving profile: {str(e)}")
             return False
         
     def get_analytics_data(self, user_id: str):
-        """Get analytics data for the given user"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        """Get analytics data for the given user (cached until their data changes)"""
+        cursor = self.get_connection().cursor()
 
-        # Mengambil data analitik berdasarkan riwayat wawancara dan profil
-        cursor.execute('''SELECT COUNT(*) FROM interview_results WHERE user_id = ?''', (user_id,))
-        total_interviews = cursor.fetchone()[0]
+        # Versi data: id terbaru di kedua tabel, berubah setiap ada hasil/Q&A baru
+        cursor.execute('''SELECT (SELECT MAX(id) FROM interview_results WHERE user_id = :uid),
+                                 (SELECT MAX(id) FROM qa_history WHERE user_id = :uid)''', {'uid': user_id})
+        return _analytics_cached(self.db_path, user_id, tuple(cursor.fetchone()))
 
-        cursor.execute('''SELECT AVG(total_score) FROM interview_results WHERE user_id = ?''', (user_id,))
-        avg_score = cursor.fetchone()[0] or 0
+    def _query_analytics(self, user_id: str):
+        """Compute analytics data for the given user"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
 
-        cursor.execute('''SELECT AVG(total_score) - ? FROM interview_results WHERE user_id = ? ORDER BY created_at LIMIT 1''', (avg_score, user_id))
-        improvement_rate = cursor.fetchone()[0] or 0
+        # Satu query tanpa scan tabel: ringkasan dari rollup, baris terbaru lewat index,
+        # dan area terkuat/terlemah dari rollup kategori
+        cursor.execute('''WITH s AS (SELECT interviews_n, mean_score, first_score
+                                  FROM user_score_stats WHERE user_id = :uid),
+                               latest AS (SELECT total_score, komunikasi, problem_solving, leadership, teamwork,
+                                              pengetahuan_teknis, adaptabilitas, kreativitas, critical_thinking
+                                       FROM interview_results WHERE user_id = :uid
+                                       ORDER BY created_at DESC, id DESC LIMIT 1),
+                               qa AS (SELECT category, sum_score / count AS avg_score
+                                      FROM user_category_stats WHERE user_id = :uid AND count > 0)
+                          SELECT COALESCE(s.interviews_n, 0) AS total_interviews,
+                                 s.mean_score AS avg_score,
+                                 s.first_score AS first_score,
+                                 latest.total_score AS latest_score,
+                                 latest.komunikasi, latest.problem_solving, latest.leadership, latest.teamwork,
+                                 latest.pengetahuan_teknis, latest.adaptabilitas, latest.kreativitas,
+                                 latest.critical_thinking,
+                                 (SELECT category FROM qa ORDER BY avg_score DESC LIMIT 1) AS strongest_category,
+                                 (SELECT avg_score FROM qa ORDER BY avg_score DESC LIMIT 1) AS strongest_score,
+                                 (SELECT category FROM qa ORDER BY avg_score ASC LIMIT 1) AS weakest_category,
+                                 (SELECT avg_score FROM qa ORDER BY avg_score ASC LIMIT 1) AS weakest_score
+                          FROM (SELECT 1) LEFT JOIN s LEFT JOIN latest''', {'uid': user_id})
+        row = cursor.fetchone()
 
-        # Mendapatkan data kekuatan dan kelemahan berdasarkan kategori
-        cursor.execute('''SELECT category, AVG(score) FROM qa_history WHERE user_id = ? GROUP BY category ORDER BY AVG(score) DESC LIMIT 1''', (user_id,))
-        strongest_area = cursor.fetchone() or ("None", 0)
+        total_interviews = row['total_interviews']
+        avg_score = row['avg_score'] or 0
 
-        cursor.execute('''SELECT category, AVG(score) FROM qa_history WHERE user_id = ? GROUP BY category ORDER BY AVG(score) ASC LIMIT 1''', (user_id,))
-        weakest_area = cursor.fetchone() or ("None", 0)
+        # Persentase perubahan dari wawancara pertama ke terbaru
+        first_score = row['first_score']
+        improvement_rate = ((row['latest_score'] - first_score) * 100.0 / first_score
+                            if total_interviews >= 2 and first_score else 0)
 
-        # Mengambil skor per kategori dari interview_results
-        cursor.execute('''SELECT komunikasi, problem_solving, leadership, teamwork, pengetahuan_teknis, adaptabilitas, kreativitas, critical_thinking
-                          FROM interview_results WHERE user_id = ? ORDER BY created_at DESC LIMIT 1''', (user_id,))
-        category_scores = cursor.fetchone()
+        strongest_area = ((row['strongest_category'], row['strongest_score'] or 0)
+                          if row['strongest_category'] is not None else ("None", 0))
+        weakest_area = ((row['weakest_category'], row['weakest_score'] or 0)
+                        if row['weakest_category'] is not None else ("None", 0))
 
         # Membuat data analitik
         analytics_data = {
@@ -193,17 +353,16 @@ class DatabaseManager:
             'improvement_rate': improvement_rate,
             'strongest_area': strongest_area,
             'weakest_area': weakest_area,
-            'category_scores': {
-                'komunikasi': category_scores[0] if category_scores else 0,
-                'problem_solving': category_scores[1] if category_scores else 0,
-                'leadership': category_scores[2] if category_scores else 0,
-                'teamwork': category_scores[3] if category_scores else 0,
-                'pengetahuan_teknis': category_scores[4] if category_scores else 0,
-                'adaptabilitas': category_scores[5] if category_scores else 0,
-                'kreativitas': category_scores[6] if category_scores else 0,
-                'critical_thinking': category_scores[7] if category_scores else 0
-            }
+            'category_scores': {key: row[key] or 0 for key in (
+                'komunikasi', 'problem_solving', 'leadership', 'teamwork',
+                'pengetahuan_teknis', 'adaptabilitas', 'kreativitas', 'critical_thinking'
+            )}
         }
         
-        conn.close()
         return analytics_data
+
+
+@st.cache_data(ttl=300, max_entries=256, show_spinner=False)
+def _analytics_cached(db_path: str, user_id: str, version: tuple) -> dict:
+    """Analytics per (user, data version); new rows change the version, so no manual invalidation"""
+    return DatabaseManager(db_path)._query_analytics(user_id)
@@ -5,6 +5,7 @@ AI Interview Training System Pro
 import streamlit as st
 from datetime import datetime
 import time
+import types
 
 # Import configurations
 from config.settings import CONFIG
@@ -12,40 +13,38 @@ from config.settings import CONFIG
 # Import services
 from database.manager import DatabaseManager
 from services.llm_service import LLMService
-from services.visualizations_service import VisualizationService
 
 # Import UI components
 from ui.components import render_header, render_sidebar
 
-# Import pages
-from ui.pages.input_page import show_input_page
-from ui.pages.interview_page import show_interview_page
-from ui.pages.results_page import show_results_page
-from ui.pages.history_page import show_history_page
-from ui.pages.analytics_page import show_analytics_page
+# Pages are imported inside their routing branch below, so a rerun only loads
+# the modules (and heavy libraries) of the page actually being shown
+
+
+# Session state defaults; callables are invoked per session so each one gets
+# its own user_id and its own (unshared) lists
+_SESSION_DEFAULTS = types.MappingProxyType({
+    'user_id': lambda: f"user_{datetime.now().strftime('%Y%m%d%H%M%S')}",
+    'stage': 'input',
+    'questions': list,
+    'answers': list,
+    'answer_metadata': list,
+    'current_question_idx': 0,
+    'interview_start_time': None,
+    'question_start_time': None,
+    'model_choice': "gpt-4o",
+    'difficulty': "Sedang",
+    'enable_voice': False,
+    'enable_camera': False,
+    'enable_timer': True
+})
 
 
 def init_session_state():
     """Initialize session state variables"""
-    default_state = {
-        'user_id': f"user_{datetime.now().strftime('%Y%m%d%H%M%S')}",
-        'stage': 'input',
-        'questions': [],
-        'answers': [],
-        'answer_metadata': [],
-        'current_question_idx': 0,
-        'interview_start_time': None,
-        'question_start_time': None,
-        'model_choice': "gpt-4o",
-        'difficulty': "Sedang",
-        'enable_voice': False,
-        'enable_camera': False,
-        'enable_timer': True
-    }
-    
-    for key, value in default_state.items():
+    for key, value in _SESSION_DEFAULTS.items():
         if key not in st.session_state:
-            st.session_state[key] = value
+            st.session_state[key] = value() if callable(value) else value
 
 
 def main():
@@ -101,14 +100,19 @@ def main():
     stage = st.session_state.get('stage', 'input')
     
     if stage == 'input':
+        from ui.pages.input_page import show_input_page
         show_input_page(db, llm)
     elif stage == 'interview':
+        from ui.pages.interview_page import show_interview_page
         show_interview_page(db, llm)
     elif stage == 'results':
+        from ui.pages.results_page import show_results_page
         show_results_page(db, llm)
     elif stage == 'history':
+        from ui.pages.history_page import show_history_page
         show_history_page(db)
     elif stage == 'analytics':
+        from ui.pages.analytics_page import show_analytics_page
         show_analytics_page(db)
     else:
         st.error(f"Unknown stage: {stage}")
@@ -1,13 +1,22 @@
-import spacy
+import functools
+
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
-# Load SpaCy NER model
-nlp = spacy.load("en_core_web_sm")  # Make sure to install it: pip install spacy && python -m spacy download en_core_web_sm
+# Example skills list, matched case-insensitively against the CV
+SKILLS = ('python', 'java', 'javascript', 'machine learning', 'data analysis')
+
+
+@functools.lru_cache(maxsize=1)
+def get_nlp():
+    """Load the SpaCy NER model once, on first use (only the NER pipe is needed)"""
+    import spacy
+    # Make sure to install it: pip install spacy && python -m spacy download en_core_web_sm
+    return spacy.load("en_core_web_sm", disable=["tagger", "parser", "attribute_ruler", "lemmatizer"])
 
 def apply_ner(cv_text):
     """Apply Named Entity Recognition to extract key entities"""
-    doc = nlp(cv_text)
+    doc = get_nlp()(cv_text)
     entities = {"PERSON": [], "ORG": [], "GPE": [], "SKILL": []}  # You can add more categories as needed
     
     for ent in doc.ents:
@@ -19,23 +28,27 @@ def apply_ner(cv_text):
             entities["GPE"].append(ent.text)
     
     # Manually add skill extraction if you want specific skills (can be extended to use more advanced methods like spaCy custom NER)
-    skills = ['python', 'java', 'javascript', 'machine learning', 'data analysis']  # Example skills list
-    for skill in skills:
-        if skill.lower() in cv_text.lower():
-            entities["SKILL"].append(skill)
+    cv_low = cv_text.lower()
+    entities["SKILL"] = [skill for skill in SKILLS if skill in cv_low]
     
     return entities
 
 
+@functools.lru_cache(maxsize=32)
+def _tfidf_matrix(documents):
+    """TF-IDF matrix of a tuple of documents, fitted once per distinct tuple"""
+    return TfidfVectorizer().fit_transform(documents)
+
+def score_jobs(cv_text, job_descriptions):
+    """Cosine similarity of the CV against each job description, from one shared TF-IDF fit"""
+    if not job_descriptions:
+        return []
+    
+    # Row 0 is the CV, the remaining rows are the job descriptions
+    tfidf_matrix = _tfidf_matrix((cv_text, *job_descriptions))
+    return cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:]).ravel()
+
+
 def apply_tfidf_cosine_similarity(cv_text, job_description):
     """Calculate cosine similarity using TF-IDF"""
-    # Combine CV text and job description for comparison
-    documents = [cv_text, job_description]
-    
-    # Vectorize the text using TF-IDF
-    vectorizer = TfidfVectorizer()
-    tfidf_matrix = vectorizer.fit_transform(documents)
-    
-    # Compute the cosine similarity between the CV and job description
-    similarity_matrix = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix)
-    return similarity_matrix[0][1]  # Cosine similarity score between CV and job description
+    return score_jobs(cv_text, [job_description])[0]  # Cosine similarity score between CV and job description
@@ -9,6 +9,17 @@ import streamlit as st
 from config.settings import DEFAULT_MODEL, MODEL_TEMPERATURE, MODEL_MAX_TOKENS
 
 
+@st.cache_resource
+def _openai_client(timeout: int, max_retries: int):
+    """Process-wide OpenAI client; its HTTP connection pool is reused across calls and reruns"""
+    import openai
+    return openai.OpenAI(
+        api_key=st.secrets.get("OPENAI_API_KEY", os.getenv("OPENAI_API_KEY")),
+        timeout=timeout,
+        max_retries=max_retries
+    )
+
+
 class LLMService:
     """Enhanced LLM service with better prompting and error handling"""
     
@@ -20,10 +31,9 @@ class LLMService:
     def _call_openai(self, messages: List[Dict], temperature: float = MODEL_TEMPERATURE) -> Optional[str]:
         """Call OpenAI API with retry logic"""
         try:
-            import openai
-            openai.api_key = st.secrets.get("OPENAI_API_KEY", os.getenv("OPENAI_API_KEY"))
+            client = _openai_client(self.timeout, self.max_retries)
             
-            response = openai.chat.completions.create(
+            response = client.chat.completions.create(
                 model=self.model,
                 messages=messages,
                 temperature=temperature,
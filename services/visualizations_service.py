@@ -1,6 +1,9 @@
-import plotly.graph_objects as go
-from typing import Dict, List
-import pandas as pd
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
 
 class VisualizationService:
     """Service to create various visualizations for interview results and analytics."""
@@ -8,6 +11,8 @@ class VisualizationService:
     @staticmethod
     def create_radar_chart(scores: Dict, title: str = "Interview Scores") -> go.Figure:
         """Create a radar chart to visualize interview scores across different categories."""
+        import plotly.graph_objects as go
+
         categories = [k.replace('_', ' ').title() for k in scores.keys()]
         values = list(scores.values())
 
@@ -58,6 +63,8 @@ class VisualizationService:
     @staticmethod
     def create_bar_chart(scores: Dict, title: str = 'Category Breakdown') -> go.Figure:
         """Create a bar chart to show interview scores for each category."""
+        import plotly.graph_objects as go
+
         categories = [k.replace('_', ' ').title() for k in scores.keys()]
         values = list(scores.values())
 
@@ -94,6 +101,8 @@ class VisualizationService:
     @staticmethod
     def create_progress_timeline(user_id: str, db) -> go.Figure:
         """Create a progress timeline to show how interview scores have changed over time."""
+        import plotly.graph_objects as go
+
         history = db.get_user_history(user_id, limit=20)
 
         if not history:
@@ -102,8 +111,9 @@ class VisualizationService:
         dates = [h['created_at'] for h in history]
         scores = [h['total_score'] for h in history]
 
+        # WebGL trace: drawn on a canvas instead of one SVG node per point
         fig = go.Figure()
-        fig.add_trace(go.Scatter(
+        fig.add_trace(go.Scattergl(
             x=dates,
             y=scores,
             mode='lines+markers',
@@ -137,6 +147,8 @@ class VisualizationService:
     @staticmethod
     def create_gauge_chart(score: float, title: str = "Overall Score") -> go.Figure:
         """Create a gauge chart to display the overall score of the interview."""
+        import plotly.graph_objects as go
+
         fig = go.Figure(go.Indicator(
             mode="gauge+number+delta",
             value=score,
@@ -173,6 +185,8 @@ class VisualizationService:
     @staticmethod
     def create_comparison_chart(current_scores: Dict, history_scores: List[Dict]) -> go.Figure:
         """Create a comparison chart to show progress between multiple interview scores."""
+        import plotly.graph_objects as go
+
         if not history_scores:
             return VisualizationService.create_bar_chart(current_scores)
 
@@ -4,11 +4,23 @@
 """
 UI Pages Module
 """
-from .input_page import show_input_page
-from .interview_page import show_interview_page
-from .results_page import show_results_page
-from .history_page import show_history_page
-from .analytics_page import show_analytics_page
+import importlib
+
+# Page modules are imported on first access, so importing one page (e.g. from
+# ui.pages.input_page) doesn't pull in every other page's dependencies
+_PAGE_MODULES = {
+    'show_input_page': '.input_page',
+    'show_interview_page': '.interview_page',
+    'show_results_page': '.results_page',
+    'show_history_page': '.history_page',
+    'show_analytics_page': '.analytics_page'
+}
+
+
+def __getattr__(name):
+    if name in _PAGE_MODULES:
+        return getattr(importlib.import_module(_PAGE_MODULES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     'show_input_page',
@@ -2,9 +2,6 @@
 Analytics Page - Comprehensive Analytics Dashboard with Advanced Insights
 """
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
 
 # Import dari utils yang sudah dipecah
@@ -17,8 +14,14 @@ from config.settings import CONFIG
 import json
 
 
+@st.fragment
 def show_analytics_page(db):
     """Enhanced analytics dashboard with comprehensive insights and predictions"""
+    # Heavy chart/dataframe libraries load only when this page is opened
+    import pandas as pd
+    import plotly.express as px
+    import plotly.graph_objects as go
+    
     st.header("📈 Analytics Dashboard")
     
     # Get analytics data
@@ -5,6 +5,7 @@ from utils.exporter import export_to_json
 from datetime import datetime
 
 
+@st.fragment
 def show_history_page(db):
     """Displays the interview history page with detailed records."""
     st.header("📚 Interview History")
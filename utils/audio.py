@@ -1,19 +1,26 @@
 """
 Audio & Text-to-Speech Utilities
 """
+import functools
 from typing import Optional
 from io import BytesIO
 import base64
 import streamlit as st
 
-try:
-    from gtts import gTTS
-except ImportError:
-    gTTS = None
+
+@functools.lru_cache(maxsize=1)
+def _get_gtts():
+    """Import gTTS on first use (None if not installed)"""
+    try:
+        from gtts import gTTS
+    except ImportError:
+        gTTS = None
+    return gTTS
 
 
 def text_to_speech(text: str, lang: str = 'id') -> Optional[bytes]:
     """Convert text to speech, return bytes mp3"""
+    gTTS = _get_gtts()
     if gTTS is None:
         st.warning("⚠️ gTTS belum terinstall. Jalankan: pip install gTTS")
         return None
@@ -1,6 +1,7 @@
 """
 Utility Helper Functions
 """
+import functools
 import hashlib
 import time
 import json
@@ -10,16 +11,22 @@ from typing import Optional, Tuple, Dict
 from io import BytesIO
 import streamlit as st
 
-# Optional imports
-try:
-    import PyPDF2
-except ImportError:
-    PyPDF2 = None
+# Optional imports, loaded on first use
+@functools.lru_cache(maxsize=1)
+def _get_pypdf2():
+    try:
+        import PyPDF2
+    except ImportError:
+        PyPDF2 = None
+    return PyPDF2
 
-try:
-    from gtts import gTTS
-except ImportError:
-    gTTS = None
+@functools.lru_cache(maxsize=1)
+def _get_gtts():
+    try:
+        from gtts import gTTS
+    except ImportError:
+        gTTS = None
+    return gTTS
 
 
 class Utils:
@@ -35,6 +42,7 @@ class Utils:
     @staticmethod
     def extract_text_from_pdf(pdf_file) -> Optional[str]:
         """Extract text from uploaded PDF file"""
+        PyPDF2 = _get_pypdf2()
         if PyPDF2 is None:
             st.error("❌ PyPDF2 not installed. pip install PyPDF2")
             return None
@@ -71,6 +79,7 @@ class Utils:
     @staticmethod
     def text_to_speech(text: str, lang: str = 'id') -> Optional[bytes]:
         """Convert text to speech"""
+        gTTS = _get_gtts()
         if gTTS is None:
             return None
         
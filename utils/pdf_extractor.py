@@ -1,17 +1,24 @@
 """
 PDF Utilities
 """
+import functools
 from typing import Optional
 import streamlit as st
 
-try:
-    import PyPDF2
-except ImportError:
-    PyPDF2 = None
+
+@functools.lru_cache(maxsize=1)
+def _get_pypdf2():
+    """Import PyPDF2 on first use (None if not installed)"""
+    try:
+        import PyPDF2
+    except ImportError:
+        PyPDF2 = None
+    return PyPDF2
 
 
 def extract_text_from_pdf(pdf_file) -> Optional[str]:
     """Extract text from uploaded PDF file"""
+    PyPDF2 = _get_pypdf2()
     if PyPDF2 is None:
         st.error("❌ PyPDF2 belum terinstall. Jalankan: pip install PyPDF2")
         return None